@@ -21,7 +21,7 @@ from pathlib import Path
 
 from .main_pipeline import main_pipeline, async_main_pipeline, process_url, process_url_async, process_urls, process_urls_concurrent
 from .config import config
-from .settings_manager import settings_manager, UserSettings
+from .settings_manager import get_settings_manager, UserSettings
 
 
 # 配置日志
@@ -158,11 +158,16 @@ async def lifespan(app: FastAPI):
     # 启动时
     logger.info("🚀 启动URL信息收集和存储API服务...")
     
+    app.state.schema_prefetch_task = None
+    
     # 测试各组件连接（使用异步方法）
     try:
         from .notion_writer import test_notion_connection_async
         from .extractor import test_extractor_async
-        from .notion_schema import get_database_schema_async
+        from .notion_schema import get_database_schema_async, schedule_prefetch
+        
+        # 后台预取Schema，与下方的连接测试重叠进行（保留任务引用，防止被回收）
+        app.state.schema_prefetch_task = schedule_prefetch(asyncio.get_running_loop())
         
         # 异步测试各组件
         notion_ok = await test_notion_connection_async()
@@ -191,6 +196,19 @@ async def lifespan(app: FastAPI):
     
     # 关闭时
     logger.info("🔽 正在关闭API服务...")
+    
+    prefetch_task = app.state.schema_prefetch_task
+    if prefetch_task is not None and not prefetch_task.done():
+        prefetch_task.cancel()
+        try:
+            await prefetch_task
+        except asyncio.CancelledError:
+            pass
+    
+    from .notion_schema import shutdown_async as shutdown_schema_api
+    from .notion_writer import shutdown_async as shutdown_notion_writer
+    await shutdown_schema_api()
+    await shutdown_notion_writer()
 
 
 # 创建FastAPI应用
@@ -661,7 +679,7 @@ async def get_settings():
     """获取当前设置"""
     try:
         # 使用设置管理器获取有效设置
-        effective_settings = settings_manager.get_effective_settings()
+        effective_settings = get_settings_manager().get_effective_settings()
         
         # 转换为字典格式
         settings_data = effective_settings.to_dict()
@@ -721,7 +739,7 @@ async def save_settings(request: SettingsRequest):
             logger.info("飞书表格ID已更新")
         
         # 更新设置
-        updated_settings = settings_manager.update_settings(updates)
+        updated_settings = get_settings_manager().update_settings(updates)
         
         return SettingsResponse(
             success=True,
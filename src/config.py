@@ -52,8 +52,8 @@ class Config:
     def notion_token(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.notion_api_key:
                 return effective_settings.notion_api_key
         except Exception:
@@ -68,8 +68,8 @@ class Config:
     def notion_database_id(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.notion_database_id:
                 return effective_settings.notion_database_id
         except Exception:
@@ -89,8 +89,8 @@ class Config:
     def dashscope_api_key(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.qwen_api_key:
                 return effective_settings.qwen_api_key
         except Exception:
@@ -114,8 +114,8 @@ class Config:
     def feishu_app_id(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.feishu_app_id:
                 return effective_settings.feishu_app_id
         except Exception:
@@ -130,8 +130,8 @@ class Config:
     def feishu_app_secret(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.feishu_app_secret:
                 return effective_settings.feishu_app_secret
         except Exception:
@@ -146,8 +146,8 @@ class Config:
     def feishu_app_token(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.feishu_app_token:
                 return effective_settings.feishu_app_token
         except Exception:
@@ -162,8 +162,8 @@ class Config:
     def feishu_table_id(self) -> str:
         # 优先使用用户设置，然后使用环境变量
         try:
-            from .settings_manager import settings_manager
-            effective_settings = settings_manager.get_effective_settings()
+            from .settings_manager import get_settings_manager
+            effective_settings = get_settings_manager().get_effective_settings()
             if effective_settings.feishu_table_id:
                 return effective_settings.feishu_table_id
         except Exception:
@@ -185,6 +185,14 @@ class Config:
         """Schema缓存最大条目数"""
         return int(os.getenv("SCHEMA_CACHE_MAXSIZE", "100"))
     
+    @property
+    def schema_cache_path(self) -> Optional[str]:
+        """Schema缓存持久化文件路径，SCHEMA_CACHE_PERSIST=false时返回None"""
+        if os.getenv("SCHEMA_CACHE_PERSIST", "true").lower() != "true":
+            return None
+        path = os.getenv("SCHEMA_CACHE_PATH", "~/.cache/zhil/schema.pkl")
+        return str(Path(path).expanduser())
+    
     # 数据处理配置
     @property
     def fuzzy_match_threshold(self) -> int:
@@ -213,6 +221,12 @@ class Config:
         """重试延迟（秒）"""
         return float(os.getenv("RETRY_DELAY", "1.0"))
     
+    # 限流配置
+    @property
+    def notion_max_rate(self) -> float:
+        """Notion API客户端限速（每秒请求数）"""
+        return float(os.getenv("NOTION_MAX_RATE", "3"))
+    
     # 日志配置
     @property
     def log_level(self) -> str:
@@ -26,6 +26,14 @@ from .feishu_normalizer import feishu_normalizer
 from .config import config
 
 
+# Notion写入操作在日志中的描述
+_OPERATION_DESC = {
+    WriteOperation.CREATE: "创建",
+    WriteOperation.UPDATE: "更新",
+    WriteOperation.SKIP: "跳过未变化的",
+}
+
+
 class ProcessingStage(Enum):
     """处理阶段枚举"""
     VALIDATION = "validation"
@@ -561,7 +569,7 @@ class AsyncMainPipeline:
                 result.stage_times["writing"] = time.time() - stage_start
                 result.end_time = time.time()
                 
-                operation_desc = "创建" if write_result.operation == WriteOperation.CREATE else "更新"
+                operation_desc = _OPERATION_DESC[write_result.operation]
                 self.logger.info(f"✅ 异步Notion写入成功，{operation_desc}页面: {write_result.page_id}")
                 
                 return True
@@ -703,9 +711,10 @@ class AsyncMainPipeline:
         
         start_time = time.time()
         
-        # 使用asyncio.gather实现真正并发
+        # 使用asyncio.gather实现真正并发，所有URL共享同一个浏览器
         tasks = [self.process_single_url_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async with self.web_scraper:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # 处理异常结果
         processed_results = []
@@ -762,6 +771,8 @@ class AsyncMainPipeline:
                           if r.writing_result and r.writing_result.operation == WriteOperation.CREATE)
         update_count = sum(1 for r in results 
                           if r.writing_result and r.writing_result.operation == WriteOperation.UPDATE)
+        skip_count = sum(1 for r in results 
+                        if r.writing_result and r.writing_result.operation == WriteOperation.SKIP)
         
         # 时间统计
         total_time = sum(r.total_time for r in results)
@@ -800,7 +811,8 @@ class AsyncMainPipeline:
             },
             "operations": {
                 "create_count": create_count,
-                "update_count": update_count
+                "update_count": update_count,
+                "skip_count": skip_count
             },
             "timing": {
                 "total_time": total_time,
@@ -1006,7 +1018,7 @@ class AsyncMainPipeline:
                 result.stage_times["writing"] = time.time() - stage_start
                 result.end_time = time.time()
                 
-                operation_desc = "创建" if write_result.operation == WriteOperation.CREATE else "更新"
+                operation_desc = _OPERATION_DESC[write_result.operation]
                 self.logger.info(f"✅ Notion写入成功，{operation_desc}页面: {write_result.page_id}")
                 
                 return True
@@ -1107,15 +1119,16 @@ class AsyncMainPipeline:
         results = []
         start_time = time.time()
         
-        for i, url in enumerate(urls):
-            self.logger.info(f"📋 处理第 {i + 1}/{len(urls)} 个URL...")
-            
-            result = await self.process_single_url(url)
-            results.append(result)
-            
-            # 批量处理间隔
-            if i < len(urls) - 1:
-                await asyncio.sleep(self.batch_delay)
+        async with self.web_scraper:
+            for i, url in enumerate(urls):
+                self.logger.info(f"📋 处理第 {i + 1}/{len(urls)} 个URL...")
+                
+                result = await self.process_single_url(url)
+                results.append(result)
+                
+                # 批量处理间隔
+                if i < len(urls) - 1:
+                    await asyncio.sleep(self.batch_delay)
         
         # 统计结果
         total_time = time.time() - start_time
@@ -1154,6 +1167,8 @@ class AsyncMainPipeline:
                           if r.writing_result and r.writing_result.operation == WriteOperation.CREATE)
         update_count = sum(1 for r in results 
                           if r.writing_result and r.writing_result.operation == WriteOperation.UPDATE)
+        skip_count = sum(1 for r in results 
+                        if r.writing_result and r.writing_result.operation == WriteOperation.SKIP)
         
         # 时间统计
         total_time = sum(r.total_time for r in results)
@@ -1186,7 +1201,8 @@ class AsyncMainPipeline:
             },
             "operations": {
                 "create_count": create_count,
-                "update_count": update_count
+                "update_count": update_count,
+                "skip_count": skip_count
             },
             "timing": {
                 "total_time": total_time,
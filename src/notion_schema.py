@@ -5,17 +5,29 @@ Notion Schema 模块
 """
 
 import json
+import logging
+import orjson
 import requests
 import httpx
 import asyncio
+import atexit
+import functools
+import os
+import pickle
+import sys
+import tempfile
 import time
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, AsyncIterator
+from dataclasses import dataclass, asdict, field as dc_field
 from cachetools import TTLCache
 from enum import Enum
 
 from .config import config
 
+logger = logging.getLogger(__name__)
+
 
 class FieldType(Enum):
     """支持的Notion字段类型枚举"""
@@ -41,7 +53,11 @@ class FieldType(Enum):
     ROLLUP = "rollup"
 
 
-@dataclass
+# Python 3.10+ 下为Schema数据类启用 __slots__，去掉每个实例的 __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class SelectOption:
     """Select/Status选项数据结构"""
     id: str
@@ -50,7 +66,7 @@ class SelectOption:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class FieldSchema:
     """字段Schema数据结构"""
     name: str
@@ -64,11 +80,11 @@ class FieldSchema:
     # Number专用
     format: Optional[str] = None
     
-    # 其他配置
+    # 原始字段定义（仅在 keep_raw=True 时保留）
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DatabaseSchema:
     """数据库Schema数据结构"""
     database_id: str
@@ -79,6 +95,9 @@ class DatabaseSchema:
     url_field: Optional[str]
     created_at: float
     
+    # 字段类型 → 字段名列表的反向索引，构建Schema时一次生成
+    fields_by_type: Dict[str, List[str]] = dc_field(default_factory=dict)
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return asdict(self)
@@ -89,10 +108,159 @@ class NotionSchemaError(Exception):
     pass
 
 
+# 字段类型字符串常量（避免热路径上的Enum .value访问）
+_T_TITLE = FieldType.TITLE.value
+_T_URL = FieldType.URL.value
+_T_SELECT = FieldType.SELECT.value
+_T_STATUS = FieldType.STATUS.value
+_T_MULTI_SELECT = FieldType.MULTI_SELECT.value
+_T_NUMBER = FieldType.NUMBER.value
+
+# 带选项列表的字段类型
+_SELECT_LIKE = frozenset({_T_SELECT, _T_STATUS, _T_MULTI_SELECT})
+
+
+# 字段类型与选项颜色的驻留字符串表（词汇量很小，相同值共享同一对象）
+_INTERN_TYPES: Dict[str, str] = {t.value: sys.intern(t.value) for t in FieldType}
+_INTERN_COLORS: Dict[str, str] = {}
+
+
+def _intern_type(raw: str) -> str:
+    """返回驻留后的字段类型字符串"""
+    interned = _INTERN_TYPES.get(raw)
+    if interned is None:
+        interned = _INTERN_TYPES.setdefault(raw, sys.intern(raw))
+    return interned
+
+
+def _intern_color(raw: str) -> str:
+    """返回驻留后的选项颜色字符串"""
+    interned = _INTERN_COLORS.get(raw)
+    if interned is None:
+        interned = _INTERN_COLORS.setdefault(raw, sys.intern(raw))
+    return interned
+
+
+def _is_fresh(created_at: float, ttl: float) -> bool:
+    """按获取时间判断Schema是否仍在TTL内（从磁盘恢复的条目不会因重新放入缓存而续期）"""
+    return time.time() - created_at < ttl
+
+
+def _read_cache_file(path: str, ttl: float) -> Dict[Any, DatabaseSchema]:
+    """读取磁盘缓存文件，只返回尚未超过TTL的Schema"""
+    try:
+        with open(path, "rb") as f:
+            entries = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("⚠️ 读取Schema缓存文件失败: %s", e)
+        return {}
+    
+    return {
+        key: schema for key, schema in entries.items()
+        if _is_fresh(schema.created_at, ttl)
+    }
+
+
+def _load_cache_file(path: Optional[str], cache: TTLCache) -> None:
+    """用磁盘缓存文件预填充内存缓存"""
+    if not path:
+        return
+    for key, schema in _read_cache_file(path, cache.ttl).items():
+        cache[key] = schema
+
+
+def _dump_cache_file(path: Optional[str], snapshot: Dict[Any, DatabaseSchema],
+                     ttl: float) -> None:
+    """将内存缓存快照合并写入磁盘缓存文件（原子替换）"""
+    if not path:
+        return
+    try:
+        entries = _read_cache_file(path, ttl)
+        entries.update(snapshot)
+        
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # 每次写入使用唯一的临时文件，同步与异步写入并发时互不覆盖
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except Exception as e:
+        logger.warning("⚠️ 写入Schema缓存文件失败: %s", e)
+
+
+def _coerce_type(field_type: Union[str, FieldType]) -> str:
+    """将字段类型参数统一为字符串（常见的str输入无需MRO检查）"""
+    if type(field_type) is str:
+        return field_type
+    if isinstance(field_type, FieldType):
+        return field_type.value
+    return field_type
+
+
+def _join_plain_text(rich_text: List[Dict[str, Any]]) -> str:
+    """拼接富文本数组的plain_text（单段时直接返回，无需join）"""
+    if len(rich_text) == 1:
+        return rich_text[0].get("plain_text", "")
+    return "".join(item.get("plain_text", "") for item in rich_text)
+
+
+def _parse_select_options(options_data: List[Dict]) -> List[SelectOption]:
+    """解析Select/Status选项"""
+    return [
+        SelectOption(
+            id=opt.get("id", ""),
+            name=opt.get("name", ""),
+            color=_intern_color(opt.get("color", "default")),
+            description=opt.get("description")
+        )
+        for opt in options_data
+    ]
+
+
+def _parse_options_kwargs(field_type: str, field_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Select/Status/Multi-select：解析选项列表"""
+    type_data = field_data.get(field_type, {})
+    return {"options": _parse_select_options(type_data.get("options", []))}
+
+
+def _parse_number_kwargs(field_type: str, field_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Number：解析数字格式"""
+    return {"format": field_data.get(_T_NUMBER, {}).get("format")}
+
+
+def _required_kwargs(field_type: str, field_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Title：标记为必需字段"""
+    return {"required": True}
+
+
+# 字段类型 → 专用解析函数（返回FieldSchema的额外构造参数）
+_FIELD_PARSERS = {
+    _T_SELECT: _parse_options_kwargs,
+    _T_STATUS: _parse_options_kwargs,
+    _T_MULTI_SELECT: _parse_options_kwargs,
+    _T_NUMBER: _parse_number_kwargs,
+    _T_TITLE: _required_kwargs,
+}
+
+
 class NotionSchemaAPI:
     """Notion Schema API客户端（同步版本）"""
     
-    def __init__(self):
+    def __init__(self, persist_path: Optional[str] = None):
+        """
+        Args:
+            persist_path: Schema缓存持久化文件路径，为None时仅使用内存缓存
+        """
         self.base_url = "https://api.notion.com/v1"
         self.headers = {
             "Authorization": f"Bearer {config.notion_token}",
@@ -100,105 +268,77 @@ class NotionSchemaAPI:
             "Content-Type": "application/json",
         }
         
+        # 同步HTTP会话（复用连接），对象被回收或进程退出时自动关闭
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self._session_finalizer = weakref.finalize(self, self.session.close)
+        
         # 初始化缓存
         self.cache = TTLCache(
             maxsize=config.schema_cache_maxsize,
             ttl=config.schema_cache_ttl
         )
-
-
-class AsyncNotionSchemaAPI:
-    """异步Notion Schema API客户端"""
-    
-    def __init__(self):
-        self.base_url = "https://api.notion.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {config.notion_token}",
-            "Notion-Version": config.notion_version,
-            "Content-Type": "application/json",
-        }
         
-        # 异步HTTP客户端与连接池
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=5),
-            headers=self.headers
-        )
+        # 从磁盘恢复未过期的Schema，进程重启后无需重新请求
+        self.persist_path = persist_path
+        _load_cache_file(persist_path, self.cache)
         
-        # 初始化缓存
-        self.cache = TTLCache(
+        # 按类型的字段名缓存，键为 (database_id, field_type)，值为 (Schema获取时间, 字段名列表)
+        self._type_index_cache = TTLCache(
             maxsize=config.schema_cache_maxsize,
             ttl=config.schema_cache_ttl
         )
     
-    async def _make_request_async(self, method: str, url: str, **kwargs) -> httpx.Response:
-        """异步HTTP请求"""
+    def close(self) -> None:
+        """关闭同步HTTP会话（可重复调用）"""
+        self._session_finalizer()
+    
+    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发起HTTP请求"""
         try:
-            response = await self.client.request(method, url, **kwargs)
+            response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
             return response
-        except httpx.RequestError as e:
-            raise NotionSchemaError(f"异步请求失败: {e}")
+        except requests.exceptions.RequestException as e:
+            raise NotionSchemaError(f"请求失败: {e}")
     
     def _parse_select_options(self, options_data: List[Dict]) -> List[SelectOption]:
-        """解析Select/Status选项（与同步版本共享）"""
-        options = []
-        for opt in options_data:
-            options.append(SelectOption(
-                id=opt.get("id", ""),
-                name=opt.get("name", ""),
-                color=opt.get("color", "default"),
-                description=opt.get("description")
-            ))
-        return options
-    
-    def _parse_field_schema(self, name: str, field_data: Dict[str, Any]) -> FieldSchema:
-        """解析单个字段Schema（与同步版本共享）"""
-        field_type = field_data.get("type", "")
+        """解析Select/Status选项"""
+        return _parse_select_options(options_data)
+    
+    def _parse_field_schema(self, name: str, field_data: Dict[str, Any],
+                            keep_raw: bool = False) -> FieldSchema:
+        """解析单个字段Schema"""
+        field_type = _intern_type(field_data.get("type", ""))
+        
+        # 特殊字段类型的额外参数（选项、数字格式；Title字段始终必需）
+        handler = _FIELD_PARSERS.get(field_type)
+        extra = handler(field_type, field_data) if handler else {}
         
-        # 基础字段信息
-        field_schema = FieldSchema(
+        return FieldSchema(
             name=name,
             type=field_type,
             description=field_data.get("description"),
-            metadata=field_data
+            metadata=field_data if keep_raw else None,
+            **extra
         )
-        
-        # 处理特殊字段类型
-        if field_type in [FieldType.SELECT.value, FieldType.STATUS.value]:
-            type_data = field_data.get(field_type, {})
-            options_data = type_data.get("options", [])
-            field_schema.options = self._parse_select_options(options_data)
-        
-        elif field_type == FieldType.MULTI_SELECT.value:
-            multi_select_data = field_data.get("multi_select", {})
-            options_data = multi_select_data.get("options", [])
-            field_schema.options = self._parse_select_options(options_data)
-        
-        elif field_type == FieldType.NUMBER.value:
-            number_data = field_data.get("number", {})
-            field_schema.format = number_data.get("format")
-        
-        # Title字段始终必需
-        if field_type == FieldType.TITLE.value:
-            field_schema.required = True
-        
-        return field_schema
     
-    async def _fetch_database_raw_async(self, database_id: str) -> Dict[str, Any]:
-        """异步从API获取原始数据库信息"""
+    def _fetch_database_raw(self, database_id: str) -> Dict[str, Any]:
+        """从API获取原始数据库信息"""
         url = f"{self.base_url}/databases/{database_id}"
-        response = await self._make_request_async("GET", url)
-        return response.json()
+        response = self._make_request("GET", url)
+        return orjson.loads(response.content)
     
-    async def get_database_schema_async(self, database_id: Optional[str] = None, 
-                                       use_cache: bool = True) -> DatabaseSchema:
+    def get_database_schema(self, database_id: Optional[str] = None, 
+                          use_cache: bool = True,
+                          keep_raw: bool = False) -> DatabaseSchema:
         """
-        异步获取数据库Schema
+        获取数据库Schema
         
         Args:
             database_id: 数据库ID，默认使用配置中的ID
             use_cache: 是否使用缓存
+            keep_raw: 是否在FieldSchema.metadata中保留原始字段定义
             
         Returns:
             DatabaseSchema: 解析后的数据库Schema
@@ -207,42 +347,47 @@ class AsyncNotionSchemaAPI:
             database_id = config.notion_database_id
         
         # 检查缓存
-        cache_key = f"schema_{database_id}"
-        if use_cache and cache_key in self.cache:
-            print(f"🔄 使用缓存的异步Schema: {database_id}")
-            return self.cache[cache_key]
+        cache = self.cache
+        cache_key = ("schema", database_id, keep_raw)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None and _is_fresh(cached.created_at, cache.ttl):
+                logger.debug("🔄 使用缓存的Schema: %s", database_id)
+                return cached
         
-        print(f"🔍 正在异步获取数据库Schema: {database_id}")
+        logger.debug("🔍 正在获取数据库Schema: %s", database_id)
         
         try:
-            # 异步获取原始数据
-            raw_data = await self._fetch_database_raw_async(database_id)
+            # 获取原始数据
+            raw_data = self._fetch_database_raw(database_id)
             
             # 解析基本信息
             title = ""
             title_data = raw_data.get("title", [])
             if title_data and isinstance(title_data, list):
-                title = "".join([item.get("plain_text", "") for item in title_data])
+                title = _join_plain_text(title_data)
             
             description = None
             desc_data = raw_data.get("description", [])
             if desc_data and isinstance(desc_data, list):
-                description = "".join([item.get("plain_text", "") for item in desc_data])
+                description = _join_plain_text(desc_data)
             
             # 解析字段
             properties = raw_data.get("properties", {})
             fields = {}
+            fields_by_type: Dict[str, List[str]] = {}
             title_field = None
             url_field = None
             
             for field_name, field_data in properties.items():
-                field_schema = self._parse_field_schema(field_name, field_data)
+                field_schema = self._parse_field_schema(field_name, field_data, keep_raw)
                 fields[field_name] = field_schema
+                fields_by_type.setdefault(field_schema.type, []).append(field_name)
                 
                 # 记录特殊字段
-                if field_schema.type == FieldType.TITLE.value:
+                if field_schema.type == _T_TITLE:
                     title_field = field_name
-                elif field_schema.type == FieldType.URL.value and not url_field:
+                elif field_schema.type == _T_URL and not url_field:
                     url_field = field_name
             
             # 构建Schema对象
@@ -253,116 +398,187 @@ class AsyncNotionSchemaAPI:
                 fields=fields,
                 title_field=title_field,
                 url_field=url_field,
-                created_at=time.time()
+                created_at=time.time(),
+                fields_by_type=fields_by_type
             )
             
             # 缓存结果
             if use_cache:
-                self.cache[cache_key] = schema
-                print(f"💾 异步Schema已缓存，TTL: {config.schema_cache_ttl}秒")
+                cache[cache_key] = schema
+                _dump_cache_file(self.persist_path, dict(cache.items()), cache.ttl)
+                logger.debug("💾 Schema已缓存，TTL: %s秒", cache.ttl)
             
-            print(f"✅ 异步成功获取Schema，包含 {len(fields)} 个字段")
+            logger.info("✅ 成功获取Schema，包含 %d 个字段", len(fields))
             return schema
             
         except Exception as e:
-            raise NotionSchemaError(f"异步获取Schema失败: {e}")
+            raise NotionSchemaError(f"获取Schema失败: {e}")
     
-    async def get_field_names_by_type_async(self, field_type: Union[str, FieldType], 
-                                          database_id: Optional[str] = None) -> List[str]:
-        """异步获取指定类型的字段名列表"""
-        schema = await self.get_database_schema_async(database_id)
-        
-        if isinstance(field_type, FieldType):
-            field_type = field_type.value
+    def get_field_names_by_type(self, field_type: Union[str, FieldType], 
+                               database_id: Optional[str] = None) -> List[str]:
+        """获取指定类型的字段名列表"""
+        field_type = _coerce_type(field_type)
+        key = (database_id or config.notion_database_id, field_type)
+        cached = self._type_index_cache.get(key)
+        if cached is not None and _is_fresh(cached[0], self._type_index_cache.ttl):
+            return list(cached[1])
         
-        return [
-            name for name, field in schema.fields.items() 
-            if field.type == field_type
-        ]
+        schema = self.get_database_schema(database_id)
+        result = list(schema.fields_by_type.get(field_type, ()))
+        # 记录Schema的获取时间，使字段名缓存与Schema同时过期
+        self._type_index_cache[key] = (schema.created_at, result)
+        return list(result)
     
-    async def get_select_options_async(self, field_name: str, 
-                                     database_id: Optional[str] = None) -> List[SelectOption]:
-        """异步获取Select/Status字段的选项列表"""
-        schema = await self.get_database_schema_async(database_id)
+    def get_select_options(self, field_name: str, 
+                          database_id: Optional[str] = None) -> List[SelectOption]:
+        """获取Select/Status字段的选项列表"""
+        schema = self.get_database_schema(database_id)
         
         if field_name not in schema.fields:
             raise NotionSchemaError(f"字段 '{field_name}' 不存在")
         
         field = schema.fields[field_name]
-        if field.type not in [FieldType.SELECT.value, FieldType.STATUS.value, FieldType.MULTI_SELECT.value]:
+        if field.type not in _SELECT_LIKE:
             raise NotionSchemaError(f"字段 '{field_name}' 不是选择类型字段")
         
         return field.options or []
+    
+    def clear_cache(self):
+        """清空缓存"""
+        self.cache.clear()
+        self._type_index_cache.clear()
+        if self.persist_path:
+            Path(self.persist_path).unlink(missing_ok=True)
+        logger.info("🗑️ 缓存已清空")
+    
+    def get_cache_info(self) -> Dict[str, Any]:
+        """获取缓存信息"""
+        return {
+            "size": len(self.cache),
+            "maxsize": self.cache.maxsize,
+            "ttl": self.cache.ttl,
+            "keys": list(self.cache.keys())
+        }
+    
+    def print_schema_summary(self, database_id: Optional[str] = None):
+        """打印Schema摘要信息（用于调试）"""
+        schema = self.get_database_schema(database_id)
+        
+        print("\n" + "="*60)
+        print(f"📊 数据库Schema摘要")
+        print("="*60)
+        print(f"数据库ID: {schema.database_id}")
+        print(f"标题: {schema.title}")
+        if schema.description:
+            print(f"描述: {schema.description}")
+        print(f"Title字段: {schema.title_field}")
+        print(f"URL字段: {schema.url_field}")
+        print(f"字段数量: {len(schema.fields)}")
+        
+        print(f"\n📋 字段列表:")
+        for name, field in schema.fields.items():
+            required_mark = " (必需)" if field.required else ""
+            print(f"  • {name} → {field.type}{required_mark}")
+            
+            # 显示选项
+            if field.options:
+                print(f"    选项: {[opt.name for opt in field.options]}")
+        
+        print("\n" + "="*60)
 
-# 继续同步版本的_make_request方法
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """发起HTTP请求"""
+
+class AsyncNotionSchemaAPI:
+    """异步Notion Schema API客户端"""
+    
+    def __init__(self, persist_path: Optional[str] = None):
+        """
+        Args:
+            persist_path: Schema缓存持久化文件路径，为None时仅使用内存缓存
+        """
+        self.base_url = "https://api.notion.com/v1"
+        self.headers = {
+            "Authorization": f"Bearer {config.notion_token}",
+            "Notion-Version": config.notion_version,
+            "Content-Type": "application/json",
+        }
+        
+        # 异步HTTP客户端与连接池
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=5),
+            headers=self.headers
+        )
+        
+        # 初始化缓存
+        self.cache = TTLCache(
+            maxsize=config.schema_cache_maxsize,
+            ttl=config.schema_cache_ttl
+        )
+        
+        # 从磁盘恢复未过期的Schema，进程重启后无需重新请求
+        self.persist_path = persist_path
+        _load_cache_file(persist_path, self.cache)
+        
+        # 按类型的字段名缓存，键为 (database_id, field_type)，值为 (Schema获取时间, 字段名列表)
+        self._type_index_cache = TTLCache(
+            maxsize=config.schema_cache_maxsize,
+            ttl=config.schema_cache_ttl
+        )
+        
+        # 进行中的Schema请求（同一数据库的并发请求合并为一次）
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+    
+    async def aclose(self) -> None:
+        """关闭异步HTTP客户端（可重复调用）"""
+        if not self.client.is_closed:
+            await self.client.aclose()
+    
+    async def _make_request_async(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """异步HTTP请求"""
         try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
+            response = await self.client.request(method, url, **kwargs)
             response.raise_for_status()
             return response
-        except requests.exceptions.RequestException as e:
-            raise NotionSchemaError(f"请求失败: {e}")
+        except httpx.RequestError as e:
+            raise NotionSchemaError(f"异步请求失败: {e}")
     
     def _parse_select_options(self, options_data: List[Dict]) -> List[SelectOption]:
-        """解析Select/Status选项"""
-        options = []
-        for opt in options_data:
-            options.append(SelectOption(
-                id=opt.get("id", ""),
-                name=opt.get("name", ""),
-                color=opt.get("color", "default"),
-                description=opt.get("description")
-            ))
-        return options
-    
-    def _parse_field_schema(self, name: str, field_data: Dict[str, Any]) -> FieldSchema:
-        """解析单个字段Schema"""
-        field_type = field_data.get("type", "")
+        """解析Select/Status选项（与同步版本共享）"""
+        return _parse_select_options(options_data)
+    
+    def _parse_field_schema(self, name: str, field_data: Dict[str, Any],
+                            keep_raw: bool = False) -> FieldSchema:
+        """解析单个字段Schema（与同步版本共享）"""
+        field_type = _intern_type(field_data.get("type", ""))
         
-        # 基础字段信息
-        field_schema = FieldSchema(
+        # 特殊字段类型的额外参数（选项、数字格式；Title字段始终必需）
+        handler = _FIELD_PARSERS.get(field_type)
+        extra = handler(field_type, field_data) if handler else {}
+        
+        return FieldSchema(
             name=name,
             type=field_type,
             description=field_data.get("description"),
-            metadata=field_data
+            metadata=field_data if keep_raw else None,
+            **extra
         )
-        
-        # 处理特殊字段类型
-        if field_type in [FieldType.SELECT.value, FieldType.STATUS.value]:
-            type_data = field_data.get(field_type, {})
-            options_data = type_data.get("options", [])
-            field_schema.options = self._parse_select_options(options_data)
-        
-        elif field_type == FieldType.MULTI_SELECT.value:
-            multi_select_data = field_data.get("multi_select", {})
-            options_data = multi_select_data.get("options", [])
-            field_schema.options = self._parse_select_options(options_data)
-        
-        elif field_type == FieldType.NUMBER.value:
-            number_data = field_data.get("number", {})
-            field_schema.format = number_data.get("format")
-        
-        # Title字段始终必需
-        if field_type == FieldType.TITLE.value:
-            field_schema.required = True
-        
-        return field_schema
     
-    def _fetch_database_raw(self, database_id: str) -> Dict[str, Any]:
-        """从API获取原始数据库信息"""
+    async def _fetch_database_raw_async(self, database_id: str) -> Dict[str, Any]:
+        """异步从API获取原始数据库信息"""
         url = f"{self.base_url}/databases/{database_id}"
-        response = self._make_request("GET", url)
-        return response.json()
+        response = await self._make_request_async("GET", url)
+        return orjson.loads(response.content)
     
-    def get_database_schema(self, database_id: Optional[str] = None, 
-                          use_cache: bool = True) -> DatabaseSchema:
+    async def get_database_schema_async(self, database_id: Optional[str] = None, 
+                                       use_cache: bool = True,
+                                       keep_raw: bool = False) -> DatabaseSchema:
         """
-        获取数据库Schema
+        异步获取数据库Schema
         
         Args:
             database_id: 数据库ID，默认使用配置中的ID
             use_cache: 是否使用缓存
+            keep_raw: 是否在FieldSchema.metadata中保留原始字段定义
             
         Returns:
             DatabaseSchema: 解析后的数据库Schema
@@ -371,42 +587,57 @@ class AsyncNotionSchemaAPI:
             database_id = config.notion_database_id
         
         # 检查缓存
-        cache_key = f"schema_{database_id}"
-        if use_cache and cache_key in self.cache:
-            print(f"🔄 使用缓存的Schema: {database_id}")
-            return self.cache[cache_key]
-        
-        print(f"🔍 正在获取数据库Schema: {database_id}")
+        cache = self.cache
+        cache_key = ("schema", database_id, keep_raw)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None and _is_fresh(cached.created_at, cache.ttl):
+                logger.debug("🔄 使用缓存的异步Schema: %s", database_id)
+                return cached
+        
+        # 已有相同数据库的请求在进行中，直接等待其结果
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logger.debug("⏳ 等待进行中的异步Schema请求: %s", database_id)
+            # shield：单个等待者被取消时不能连带取消共享的 future
+            return await asyncio.shield(inflight)
+        
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = fut
+        
+        logger.debug("🔍 正在异步获取数据库Schema: %s", database_id)
         
         try:
-            # 获取原始数据
-            raw_data = self._fetch_database_raw(database_id)
+            # 异步获取原始数据
+            raw_data = await self._fetch_database_raw_async(database_id)
             
             # 解析基本信息
             title = ""
             title_data = raw_data.get("title", [])
             if title_data and isinstance(title_data, list):
-                title = "".join([item.get("plain_text", "") for item in title_data])
+                title = _join_plain_text(title_data)
             
             description = None
             desc_data = raw_data.get("description", [])
             if desc_data and isinstance(desc_data, list):
-                description = "".join([item.get("plain_text", "") for item in desc_data])
+                description = _join_plain_text(desc_data)
             
             # 解析字段
             properties = raw_data.get("properties", {})
             fields = {}
+            fields_by_type: Dict[str, List[str]] = {}
             title_field = None
             url_field = None
             
             for field_name, field_data in properties.items():
-                field_schema = self._parse_field_schema(field_name, field_data)
+                field_schema = self._parse_field_schema(field_name, field_data, keep_raw)
                 fields[field_name] = field_schema
+                fields_by_type.setdefault(field_schema.type, []).append(field_name)
                 
                 # 记录特殊字段
-                if field_schema.type == FieldType.TITLE.value:
+                if field_schema.type == _T_TITLE:
                     title_field = field_name
-                elif field_schema.type == FieldType.URL.value and not url_field:
+                elif field_schema.type == _T_URL and not url_field:
                     url_field = field_name
             
             # 构建Schema对象
@@ -417,103 +648,194 @@ class AsyncNotionSchemaAPI:
                 fields=fields,
                 title_field=title_field,
                 url_field=url_field,
-                created_at=time.time()
+                created_at=time.time(),
+                fields_by_type=fields_by_type
             )
             
             # 缓存结果
             if use_cache:
-                self.cache[cache_key] = schema
-                print(f"💾 Schema已缓存，TTL: {config.schema_cache_ttl}秒")
+                cache[cache_key] = schema
+                # 磁盘写入放到线程中执行，避免阻塞事件循环
+                await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                    _dump_cache_file, self.persist_path, dict(cache.items()), cache.ttl
+                ))
+                logger.debug("💾 异步Schema已缓存，TTL: %s秒", cache.ttl)
             
-            print(f"✅ 成功获取Schema，包含 {len(fields)} 个字段")
-            return schema
+            logger.info("✅ 异步成功获取Schema，包含 %d 个字段", len(fields))
+            if not fut.done():
+                fut.set_result(schema)
             
         except Exception as e:
-            raise NotionSchemaError(f"获取Schema失败: {e}")
+            if not fut.done():
+                fut.set_exception(NotionSchemaError(f"异步获取Schema失败: {e}"))
+        
+        finally:
+            # 发起请求的任务被取消时也要唤醒等待者，避免其永久挂起；
+            # 用异常而非取消通知，等待者不会误以为自身被取消
+            if not fut.done():
+                fut.set_exception(NotionSchemaError("异步获取Schema被中断，请重试"))
+                fut.exception()  # 标记为已读取，没有等待者时不产生警告
+            del self._inflight[cache_key]
+        
+        return await fut
     
-    def get_field_names_by_type(self, field_type: Union[str, FieldType], 
-                               database_id: Optional[str] = None) -> List[str]:
-        """获取指定类型的字段名列表"""
-        schema = self.get_database_schema(database_id)
+    async def _fetch_page_async(self, url: str, body: Dict[str, Any],
+                                start_cursor: Optional[str] = None) -> Dict[str, Any]:
+        """异步获取分页查询的一页结果"""
+        if start_cursor:
+            body = {**body, "start_cursor": start_cursor}
+        response = await self._make_request_async("POST", url, json=body)
+        return orjson.loads(response.content)
+    
+    async def _paginate_async(self, url: str, body: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        异步分页遍历查询结果
         
-        if isinstance(field_type, FieldType):
-            field_type = field_type.value
+        Notion的游标分页只能串行推进，这里在调用方处理当前页时
+        就提前发起下一页请求，使网络往返与解析重叠进行。
         
-        return [
-            name for name, field in schema.fields.items() 
-            if field.type == field_type
-        ]
+        Args:
+            url: 查询接口URL
+            body: 查询请求体（filter、sorts、page_size等）
+            
+        Yields:
+            每一页的results列表
+        """
+        page = await self._fetch_page_async(url, body)
+        while True:
+            next_task = None
+            if page.get("has_more") and page.get("next_cursor"):
+                next_task = asyncio.ensure_future(
+                    self._fetch_page_async(url, body, page["next_cursor"])
+                )
+            try:
+                yield page.get("results", [])
+            except BaseException:
+                if next_task is not None:
+                    next_task.cancel()
+                raise
+            if next_task is None:
+                return
+            page = await next_task
     
-    def get_select_options(self, field_name: str, 
-                          database_id: Optional[str] = None) -> List[SelectOption]:
-        """获取Select/Status字段的选项列表"""
-        schema = self.get_database_schema(database_id)
+    async def query_database_async(self, database_id: Optional[str] = None,
+                                   query_filter: Optional[Dict[str, Any]] = None,
+                                   page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        异步分页查询数据库中的页面
         
-        if field_name not in schema.fields:
-            raise NotionSchemaError(f"字段 '{field_name}' 不存在")
+        Args:
+            database_id: 数据库ID，默认使用配置中的ID
+            query_filter: Notion查询过滤条件
+            page_size: 每页数量（Notion上限为100）
+            
+        Yields:
+            每一页的页面列表
+        """
+        if database_id is None:
+            database_id = config.notion_database_id
         
-        field = schema.fields[field_name]
-        if field.type not in [FieldType.SELECT.value, FieldType.STATUS.value, FieldType.MULTI_SELECT.value]:
-            raise NotionSchemaError(f"字段 '{field_name}' 不是选择类型字段")
+        body: Dict[str, Any] = {"page_size": page_size}
+        if query_filter:
+            body["filter"] = query_filter
         
-        return field.options or []
+        url = f"{self.base_url}/databases/{database_id}/query"
+        async for results in self._paginate_async(url, body):
+            yield results
     
-    def clear_cache(self):
-        """清空缓存"""
-        self.cache.clear()
-        print("🗑️ 缓存已清空")
+    async def prefetch_async(self, database_id: Optional[str] = None) -> None:
+        """
+        预取数据库Schema以预热缓存
+        
+        失败时仅记录，不抛出异常，适合后台fire-and-forget调用。
+        
+        Args:
+            database_id: 数据库ID，默认使用配置中的ID
+        """
+        try:
+            await self.get_database_schema_async(database_id, use_cache=True)
+        except Exception as e:
+            logger.warning("⚠️ 异步Schema预取失败: %s", e)
     
-    def get_cache_info(self) -> Dict[str, Any]:
-        """获取缓存信息"""
-        return {
-            "size": len(self.cache),
-            "maxsize": self.cache.maxsize,
-            "ttl": self.cache.ttl,
-            "keys": list(self.cache.keys())
-        }
+    async def get_field_names_by_type_async(self, field_type: Union[str, FieldType], 
+                                          database_id: Optional[str] = None) -> List[str]:
+        """异步获取指定类型的字段名列表"""
+        field_type = _coerce_type(field_type)
+        key = (database_id or config.notion_database_id, field_type)
+        cached = self._type_index_cache.get(key)
+        if cached is not None and _is_fresh(cached[0], self._type_index_cache.ttl):
+            return list(cached[1])
+        
+        schema = await self.get_database_schema_async(database_id)
+        result = list(schema.fields_by_type.get(field_type, ()))
+        # 记录Schema的获取时间，使字段名缓存与Schema同时过期
+        self._type_index_cache[key] = (schema.created_at, result)
+        return list(result)
     
-    def print_schema_summary(self, database_id: Optional[str] = None):
-        """打印Schema摘要信息（用于调试）"""
-        schema = self.get_database_schema(database_id)
+    async def get_select_options_async(self, field_name: str, 
+                                     database_id: Optional[str] = None) -> List[SelectOption]:
+        """异步获取Select/Status字段的选项列表"""
+        schema = await self.get_database_schema_async(database_id)
         
-        print("\n" + "="*60)
-        print(f"📊 数据库Schema摘要")
-        print("="*60)
-        print(f"数据库ID: {schema.database_id}")
-        print(f"标题: {schema.title}")
-        if schema.description:
-            print(f"描述: {schema.description}")
-        print(f"Title字段: {schema.title_field}")
-        print(f"URL字段: {schema.url_field}")
-        print(f"字段数量: {len(schema.fields)}")
+        if field_name not in schema.fields:
+            raise NotionSchemaError(f"字段 '{field_name}' 不存在")
         
-        print(f"\n📋 字段列表:")
-        for name, field in schema.fields.items():
-            required_mark = " (必需)" if field.required else ""
-            print(f"  • {name} → {field.type}{required_mark}")
-            
-            # 显示选项
-            if field.options:
-                print(f"    选项: {[opt.name for opt in field.options]}")
+        field = schema.fields[field_name]
+        if field.type not in _SELECT_LIKE:
+            raise NotionSchemaError(f"字段 '{field_name}' 不是选择类型字段")
         
-        print("\n" + "="*60)
+        return field.options or []
 
 
 # 全局Schema API实例
-schema_api = NotionSchemaAPI()
-async_schema_api = AsyncNotionSchemaAPI()
+schema_api = NotionSchemaAPI(persist_path=config.schema_cache_path)
+atexit.register(schema_api.close)
+async_schema_api = AsyncNotionSchemaAPI(persist_path=config.schema_cache_path)
 
 
 def get_database_schema(database_id: Optional[str] = None, 
-                       use_cache: bool = True) -> DatabaseSchema:
+                       use_cache: bool = True,
+                       keep_raw: bool = False) -> DatabaseSchema:
     """便捷函数：获取数据库Schema（同步版本）"""
-    return schema_api.get_database_schema(database_id, use_cache)
+    return schema_api.get_database_schema(database_id, use_cache, keep_raw)
 
 
 async def get_database_schema_async(database_id: Optional[str] = None, 
-                                   use_cache: bool = True) -> DatabaseSchema:
+                                   use_cache: bool = True,
+                                   keep_raw: bool = False) -> DatabaseSchema:
     """便捷函数：异步获取数据库Schema"""
-    return await async_schema_api.get_database_schema_async(database_id, use_cache)
+    return await async_schema_api.get_database_schema_async(database_id, use_cache, keep_raw)
+
+
+async def shutdown_async() -> None:
+    """
+    便捷函数：关闭全局Schema API持有的连接
+    
+    异步客户端无法在进程退出时自动关闭，应在应用生命周期的关闭阶段调用::
+    
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            yield
+            await shutdown_async()
+    """
+    await async_schema_api.aclose()
+
+
+def schedule_prefetch(loop: asyncio.AbstractEventLoop) -> asyncio.Task:
+    """
+    便捷函数：在事件循环中后台预取Schema
+    
+    在应用启动钩子中调用，使Schema获取与其他启动I/O重叠进行，
+    首个真正的请求即可直接命中缓存（或等待进行中的请求）::
+    
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            schedule_prefetch(asyncio.get_running_loop())
+            yield
+    
+    Quart等框架可在 ``before_serving`` 钩子中以同样方式调用。
+    """
+    return loop.create_task(async_schema_api.prefetch_async())
 
 
 def get_field_by_type(field_type: Union[str, FieldType], 
@@ -4,28 +4,63 @@ NotionWriter模块
 支持同步和异步两种模式
 """
 
+import sys
 import time
 import json
+import random
+import hashlib
+import functools
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Dict, Hashable, List, Mapping, Optional, Tuple, TypeVar
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import httpx
 
 from .config import config
 from .notion_schema import DatabaseSchema, get_database_schema
 
 
-class WriteOperation(Enum):
-    """写入操作类型"""
-    CREATE = "create"
-    UPDATE = "update"
-    SKIP = "skip"
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
 
+# 每次写入都会构造WriteResult，Python 3.10+ 使用slots减少实例开销
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+T = TypeVar("T")
+
+
+class WriteOperation(IntEnum):
+    """写入操作类型（整数枚举，比较更快；对外序列化仍使用字符串名称）"""
+    CREATE = 1
+    UPDATE = 2
+    SKIP = 3
+
+
+# 对外JSON中使用的操作名称
+_OPERATION_NAMES = {
+    WriteOperation.CREATE: "create",
+    WriteOperation.UPDATE: "update",
+    WriteOperation.SKIP: "skip",
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class WriteResult:
     """写入结果"""
     success: bool
@@ -40,7 +75,7 @@ class WriteResult:
         """转换为字典格式"""
         return {
             "success": self.success,
-            "operation": self.operation.value,
+            "operation": _OPERATION_NAMES[self.operation],
             "page_id": self.page_id,
             "url": self.url,
             "error_message": self.error_message,
@@ -54,130 +89,395 @@ class NotionWriterError(Exception):
     pass
 
 
-class NotionWriter:
-    """Notion数据库写入器（同步版本）"""
+# URL → page_id 缓存的最大条目数
+_URL_CACHE_MAXSIZE = 10_000
+
+# 5xx可重试状态码与允许重试的幂等方法（同步会话与异步客户端共用）
+_RETRY_STATUS = frozenset({500, 502, 503, 504})
+_RETRY_METHODS = frozenset({"GET", "PATCH"})
+
+# 批量写入项中携带已知页面ID的键（不属于Notion属性，写入前移除）
+_PAGE_ID_KEY = "_page_id"
+
+# 批量查重时单次or查询包含的URL数量上限
+_BULK_QUERY_CHUNK = 100
+
+
+def _build_headers() -> Mapping[str, str]:
+    """构建Notion API请求头（只读，由会话/客户端在创建时持有一份）"""
+    return MappingProxyType({
+        "Authorization": f"Bearer {config.notion_token}",
+        "Notion-Version": config.notion_version,
+        "Content-Type": "application/json",
+        # 查询结果可能较大，显式声明接受压缩响应
+        "Accept-Encoding": "gzip, deflate",
+    })
+
+
+def _extract_url(properties: Dict[str, Any]) -> Optional[str]:
+    """取出属性中的URL字段值（没有时返回None）"""
+    block = properties.get("URL")
+    return block.get("url") if isinstance(block, dict) else None
+
+
+def _dedupe_by_url(items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    按URL合并批量写入项
     
-    def __init__(self):
-        """初始化NotionWriter"""
-        self.base_url = "https://api.notion.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {config.notion_token}",
-            "Notion-Version": config.notion_version,
-            "Content-Type": "application/json",
-        }
+    同一URL的多个项合并为一个（后出现的属性覆盖先出现的），没有URL的项保持独立。
+    
+    Returns:
+        (去重后的项列表, 每个原始项对应的去重后下标)
+    """
+    unique: List[Dict[str, Any]] = []
+    index_of_url: Dict[str, int] = {}
+    mapping: List[int] = []
+    
+    for properties in items:
+        url = _extract_url(properties)
+        if url and url in index_of_url:
+            idx = index_of_url[url]
+            unique[idx] = {**unique[idx], **properties}
+        else:
+            idx = len(unique)
+            unique.append(properties)
+            if url:
+                index_of_url[url] = idx
+        mapping.append(idx)
+    
+    return unique, mapping
+
+
+@functools.lru_cache(maxsize=256)
+def _create_body_prefix(database_id: str) -> bytes:
+    """创建页面请求体中与属性无关的固定前缀，按数据库缓存"""
+    return orjson.dumps({"parent": {"database_id": database_id}})[:-1] + b',"properties":'
+
+
+def _create_page_body(database_id: str, properties: Dict[str, Any]) -> bytes:
+    """拼接创建页面的请求体，只需序列化properties本身"""
+    return _create_body_prefix(database_id) + orjson.dumps(properties) + b"}"
+
+
+def _properties_digest(properties: Dict[str, Any]) -> bytes:
+    """属性内容摘要（键排序后序列化），用于判断更新是否为空操作"""
+    return hashlib.blake2b(orjson.dumps(properties, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
+
+def _page_missing(status_code: int, content: bytes) -> bool:
+    """更新失败是否因为页面已不存在（404/object_not_found，或页面已被归档）"""
+    if status_code == 404:
+        return True
+    return status_code == 400 and b"archived" in content
+
+
+def _count_results(results: List[WriteResult]) -> Tuple[int, int, int, int]:
+    """一次遍历统计 (成功数, 成功创建数, 成功更新数, 跳过数)"""
+    success_count = create_count = update_count = skip_count = 0
+    for r in results:
+        if not r.success:
+            continue
+        success_count += 1
+        if r.operation is WriteOperation.CREATE:
+            create_count += 1
+        elif r.operation is WriteOperation.UPDATE:
+            update_count += 1
+        elif r.operation is WriteOperation.SKIP:
+            skip_count += 1
+    return success_count, create_count, update_count, skip_count
+
+
+def _backoff_delay(headers: Any, attempt: int, base: float = 0.5) -> float:
+    """
+    计算限流重试的等待时间
+    
+    取服务端Retry-After与带抖动的指数退避二者中的较大值。
+    """
+    backoff = (2 ** attempt) * base + random.uniform(0, base)
+    try:
+        retry_after = float(headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        retry_after = 0.0
+    return max(retry_after, backoff)
+
+
+class TokenBucket:
+    """线程安全的令牌桶限速器，每次发出请求前先取一个令牌"""
+    
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """
+        补充后预订一个令牌，返回预订者还需等待的秒数（须持有self._lock调用）
         
-        # 设置日志
-        self.logger = logging.getLogger(__name__)
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        令牌不足时允许透支为负数，后到的调用方等待更久，按到达顺序依次放行。
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+    
+    def acquire(self) -> None:
+        """获取一个令牌，不足时阻塞等待"""
+        with self._lock:
+            wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
 
 
-class AsyncNotionWriter:
-    """异步Notion数据库写入器"""
+class AsyncTokenBucket(TokenBucket):
+    """协程版令牌桶，等待期间不阻塞事件循环；同一个桶可同时供同步与异步调用方使用"""
+    
+    async def acquire_async(self) -> None:
+        """获取一个令牌，不足时异步等待"""
+        with self._lock:
+            wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# 进程内所有Notion写入器（同步、异步及批量写入使用的后台写入器）共享的令牌桶，
+# Notion按集成统一限速，各写入器分别限速会使总速率成倍超出
+_request_bucket = AsyncTokenBucket(max(1, int(config.notion_max_rate)), config.notion_max_rate)
+
+
+async def _log_error_response(response: httpx.Response) -> None:
+    """异步客户端响应钩子：统一记录Notion返回的错误响应"""
+    if response.status_code >= 400:
+        await response.aread()
+        request = response.request
+        logger.warning("⚠️ Notion %s %s -> %d %s", request.method, request.url.path,
+                       response.status_code, response.text[:200])
+
+
+class _AsyncLoopThread:
+    """在后台守护线程中常驻运行的事件循环，供同步代码提交协程"""
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """首次使用时启动事件循环线程"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="notion-writer-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+    
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        """提交协程到后台循环执行，返回可阻塞等待的Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+
+_loop_thread = _AsyncLoopThread()
+
+
+class _LRUCache:
+    """线程安全的LRU缓存，同步与异步写入器共用"""
+    
+    def __init__(self, maxsize: int = _URL_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取缓存值并标记为最近使用"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        """移除指定条目"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def evict_value(self, value: Any) -> None:
+        """移除所有值等于 value 的条目"""
+        with self._lock:
+            for key in [k for k, v in self._data.items() if v == value]:
+                del self._data[key]
+
+
+# 进程内所有写入器共享的页面缓存：单条写入与批量写入（后台异步写入器）看到同一份状态
+# (database_id, url) → page_id
+_shared_page_ids = _LRUCache()
+# page_id → 最近一次成功写入的属性摘要，内容未变时跳过PATCH
+_shared_page_digests = _LRUCache()
+
+
+class NotionWriter:
+    """Notion数据库写入器（同步版本）"""
     
     def __init__(self):
-        """初始化异步NotionWriter"""
+        """初始化NotionWriter"""
         self.base_url = "https://api.notion.com/v1"
-        self.headers = {
-            "Authorization": f"Bearer {config.notion_token}",
-            "Notion-Version": config.notion_version,
-            "Content-Type": "application/json",
-        }
+        # 常用请求路径预先拼好，逐项写入时不再重复构建
+        self._pages_url = f"{self.base_url}/pages"
+        self._query_url_tmpl = self.base_url + "/databases/%s/query"
+        self.headers = _build_headers()
         
-        # 异步HTTP客户端与连接池
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=5),
-            headers=self.headers
+        # 持久HTTP会话与连接池，复用keep-alive连接避免每次请求重新握手
+        # 连接错误和5xx只对幂等方法重试；POST创建页面不重试，避免重复建页
+        self.session = requests.Session()
+        self.session.headers.update(dict(self.headers))
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=config.max_retries,
+                backoff_factor=0.5,
+                status_forcelist=sorted(_RETRY_STATUS),
+                allowed_methods=_RETRY_METHODS,
+                raise_on_status=False
+            )
         )
+        self.session.mount("https://", adapter)
+        self._session_finalizer = weakref.finalize(self, self.session.close)
         
-        # 设置日志
-        self.logger = logging.getLogger(__name__)
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+        # 进程内共享的令牌桶，主动限速比触发429后再重试更快
+        self._bucket = _request_bucket
+        
+        # (database_id, url) → page_id 与 page_id → 属性摘要 的缓存（进程内共享）
+        self._url_cache = _shared_page_ids
+        self._page_digests = _shared_page_digests
+        
+        # 批量写入使用的异步写入器（运行在后台事件循环线程中，首次批量写入时创建）
+        self._async_writer: Optional["AsyncNotionWriter"] = None
     
-    async def _make_request_async(self, method: str, url: str, **kwargs) -> httpx.Response:
-        """异步HTTP请求"""
+    def close(self) -> None:
+        """关闭HTTP会话及批量写入使用的异步客户端（可重复调用）"""
+        self._session_finalizer()
+        if self._async_writer is not None:
+            _loop_thread.submit(self._async_writer.aclose()).result()
+    
+    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发起HTTP请求（遇到429时按Retry-After与指数退避重试）"""
+        max_retries = config.max_retries
+        # 用orjson预先序列化请求体，避免requests内部使用标准库json编码
+        if "json" in kwargs:
+            kwargs["data"] = orjson.dumps(kwargs.pop("json"))
         try:
-            response = await self.client.request(method, url, **kwargs)
-            return response
-        except httpx.RequestError as e:
-            raise NotionWriterError(f"异步请求失败: {e}")
+            for attempt in range(max_retries + 1):
+                self._bucket.acquire()
+                response = self.session.request(method, url, **kwargs)
+                if response.status_code != 429 or attempt == max_retries:
+                    return response
+                
+                delay = _backoff_delay(response.headers, attempt)
+                logger.warning("⏳ 触发Notion限流(429)，%.2f秒后重试 (%d/%d)", delay, attempt + 1, max_retries)
+                time.sleep(delay)
+        except requests.exceptions.RequestException as e:
+            raise NotionWriterError(f"请求失败: {e}")
     
-    async def _query_pages_by_url_async(self, url: str, database_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """异步根据URL查询现有页面"""
-        if database_id is None:
-            database_id = config.notion_database_id
+    def _get_cached_page_id(self, database_id: str, url: str) -> Optional[str]:
+        """从URL缓存中获取page_id"""
+        return self._url_cache.get((database_id, url))
+    
+    def _cache_page_id(self, database_id: str, url: str, page_id: str) -> None:
+        """写入URL缓存"""
+        self._url_cache.put((database_id, url), page_id)
+    
+    def _evict_page_id(self, page_id: str) -> None:
+        """从URL缓存和内容摘要缓存中移除该页面"""
+        self._url_cache.evict_value(page_id)
+        self._page_digests.pop(page_id)
+    
+    def _remember_digest(self, page_id: str, digest: bytes) -> None:
+        """记录页面最近一次成功写入的属性摘要"""
+        self._page_digests.put(page_id, digest)
+    
+    def _query_page_id_by_url(self, url: str, database_id: str) -> Optional[str]:
+        """
+        根据URL查询现有页面ID（upsert快速路径，只取第一个匹配页面的ID）
         
-        # 构建查询条件
-        query_filter = {
-            "property": "URL",
-            "url": {"equals": url}
-        }
+        Returns:
+            页面ID，未找到或查询失败时返回None
+        """
+        cached_page_id = self._get_cached_page_id(database_id, url)
+        if cached_page_id:
+            return cached_page_id
         
         query_payload = {
-            "filter": query_filter,
-            "page_size": 10
+            "filter": {"property": "URL", "url": {"equals": url}},
+            "page_size": 1
         }
-        
-        query_url = f"{self.base_url}/databases/{database_id}/query"
+        query_url = self._query_url_tmpl % database_id
         
         try:
-            response = await self._make_request_async("POST", query_url, json=query_payload)
+            # 只需要页面ID：filter_properties仅返回标题属性，避免下载整页属性
+            response = self._make_request(
+                "POST", query_url, params={"filter_properties": "title"}, json=query_payload
+            )
+            if not response.ok:
+                logger.warning("查询页面失败: %d - %s", response.status_code, response.text)
+                return None
             
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("results", [])
-            else:
-                self.logger.warning(f"异步查询页面失败: {response.status_code} - {response.text}")
-                return []
-                
+            results = orjson.loads(response.content).get("results") or ()
+            page_id = results[0].get("id") if results else None
+            if page_id:
+                self._cache_page_id(database_id, url, page_id)
+            return page_id
+        
         except Exception as e:
-            self.logger.error(f"异步查询页面异常: {e}")
-            return []
+            logger.error("查询页面异常: %s", e)
+            return None
     
-    async def _create_page_async(self, properties: Dict[str, Any], database_id: Optional[str] = None) -> WriteResult:
-        """异步创建新页面"""
-        start_time = time.time()
+    def _create_page(self, properties: Dict[str, Any], database_id: Optional[str] = None,
+                     url_hint: Optional[str] = None) -> WriteResult:
+        """
+        创建新页面
+        
+        Args:
+            properties: 页面属性
+            database_id: 数据库ID
+            url_hint: 调用方已取出的URL，省去再次解析properties
+            
+        Returns:
+            WriteResult: 写入结果
+        """
+        start_time = time.perf_counter()
         
         if database_id is None:
             database_id = config.notion_database_id
         
-        payload = {
-            "parent": {"database_id": database_id},
-            "properties": properties
-        }
-        
-        create_url = f"{self.base_url}/pages"
+        body = _create_page_body(database_id, properties)
+        create_url = self._pages_url
         
         try:
-            self.logger.info(f"📝 异步创建新页面...")
+            logger.info("📝 创建新页面...")
             
-            response = await self._make_request_async("POST", create_url, json=payload)
-            processing_time = time.time() - start_time
+            response = self._make_request("POST", create_url, data=body)
+            processing_time = time.perf_counter() - start_time
             
-            if response.status_code == 200:
-                data = response.json()
+            if response.ok:
+                data = orjson.loads(response.content)
                 page_id = data.get("id")
                 
-                # 尝试获取URL
-                url = None
-                if "URL" in properties and "url" in properties["URL"]:
-                    url = properties["URL"]["url"]
+                url = url_hint if url_hint is not None else _extract_url(properties)
+                if page_id:
+                    self._remember_digest(page_id, _properties_digest(properties))
                 
-                self.logger.info(f"✅ 异步页面创建成功，Page ID: {page_id}")
+                logger.info("✅ 页面创建成功，Page ID: %s", page_id)
                 
                 return WriteResult(
                     success=True,
@@ -187,8 +487,8 @@ class AsyncNotionWriter:
                     processing_time=processing_time
                 )
             else:
-                error_msg = f"异步创建页面失败: {response.status_code} - {response.text}"
-                self.logger.error(f"❌ {error_msg}")
+                error_msg = f"创建页面失败: {response.status_code} - {response.text}"
+                logger.error("❌ %s", error_msg)
                 
                 return WriteResult(
                     success=False,
@@ -198,9 +498,9 @@ class AsyncNotionWriter:
                 )
                 
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"异步创建页面异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"创建页面异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
@@ -209,31 +509,53 @@ class AsyncNotionWriter:
                 processing_time=processing_time
             )
     
-    async def _update_page_async(self, page_id: str, properties: Dict[str, Any]) -> WriteResult:
-        """异步更新现有页面"""
-        start_time = time.time()
+    def _update_page(self, page_id: str, properties: Dict[str, Any],
+                     url_hint: Optional[str] = None,
+                     missing_ok: bool = False) -> Optional[WriteResult]:
+        """
+        更新现有页面
+        
+        Args:
+            page_id: 页面ID
+            properties: 要更新的属性
+            url_hint: 调用方已取出的URL，省去再次解析properties
+            missing_ok: 为True时，页面已不存在（404或已归档）返回None，由调用方回退
+            
+        Returns:
+            WriteResult: 写入结果；missing_ok且页面已不存在时为None
+        """
+        start_time = time.perf_counter()
+        
+        # 属性与上次成功写入的内容一致时无需再次PATCH
+        digest = _properties_digest(properties)
+        if self._page_digests.get(page_id) == digest:
+            logger.info("⏭️ 页面内容未变化，跳过更新: %s", page_id)
+            return WriteResult(
+                success=True,
+                operation=WriteOperation.SKIP,
+                page_id=page_id,
+                url=url_hint if url_hint is not None else _extract_url(properties),
+                processing_time=0.0,
+                existing_page_found=True
+            )
         
         payload = {
             "properties": properties
         }
         
-        update_url = f"{self.base_url}/pages/{page_id}"
+        update_url = f"{self._pages_url}/{page_id}"
         
         try:
-            self.logger.info(f"🔄 异步更新页面 {page_id}...")
+            logger.info("🔄 更新页面 %s...", page_id)
             
-            response = await self._make_request_async("PATCH", update_url, json=payload)
-            processing_time = time.time() - start_time
+            response = self._make_request("PATCH", update_url, json=payload)
+            processing_time = time.perf_counter() - start_time
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # 尝试获取URL
-                url = None
-                if "URL" in properties and "url" in properties["URL"]:
-                    url = properties["URL"]["url"]
+            if response.ok:
+                url = url_hint if url_hint is not None else _extract_url(properties)
+                self._remember_digest(page_id, digest)
                 
-                self.logger.info(f"✅ 异步页面更新成功，Page ID: {page_id}")
+                logger.info("✅ 页面更新成功，Page ID: %s", page_id)
                 
                 return WriteResult(
                     success=True,
@@ -244,8 +566,12 @@ class AsyncNotionWriter:
                     existing_page_found=True
                 )
             else:
-                error_msg = f"异步更新页面失败: {response.status_code} - {response.text}"
-                self.logger.error(f"❌ {error_msg}")
+                if missing_ok and _page_missing(response.status_code, response.content):
+                    logger.info("🔍 页面已不存在: %s", page_id)
+                    return None
+                
+                error_msg = f"更新页面失败: {response.status_code} - {response.text}"
+                logger.error("❌ %s", error_msg)
                 
                 return WriteResult(
                     success=False,
@@ -257,9 +583,9 @@ class AsyncNotionWriter:
                 )
                 
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"异步更新页面异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"更新页面异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
@@ -270,201 +596,415 @@ class AsyncNotionWriter:
                 existing_page_found=True
             )
     
-    async def upsert_async(self, properties: Dict[str, Any], database_id: Optional[str] = None,
-                          force_create: bool = False) -> WriteResult:
-        """异步幂等写入（创建或更新）"""
+    def upsert(self, properties: Dict[str, Any], database_id: Optional[str] = None,
+               force_create: bool = False, page_id: Optional[str] = None) -> WriteResult:
+        """
+        幂等写入（创建或更新）
+        
+        Args:
+            properties: 页面属性
+            database_id: 数据库ID
+            force_create: 强制创建新页面，不检查重复
+            page_id: 调用方已知的页面ID（如来自之前的写入记录）。提供时跳过查重直接更新；
+                页面已不存在（404或已归档）时回退为按URL查重后更新或创建，其他失败直接返回
+            
+        Returns:
+            WriteResult: 写入结果
+        """
         try:
             # 获取URL用于查重
-            url = None
-            if "URL" in properties and "url" in properties["URL"]:
-                url = properties["URL"]["url"]
+            url = _extract_url(properties)
+            
+            if page_id and not force_create:
+                logger.info("⚡ 已知页面ID，直接更新页面: %s", page_id)
+                result = self._update_page(page_id, properties, url, missing_ok=True)
+                if result is not None:
+                    if result.success and url:
+                        self._cache_page_id(database_id or config.notion_database_id, url, page_id)
+                    return result
+                self._evict_page_id(page_id)
             
             if not url:
-                self.logger.warning("⚠️ 没有URL字段，无法查重，将异步创建新页面")
-                return await self._create_page_async(properties, database_id)
+                logger.warning("⚠️ 没有URL字段，无法查重，将创建新页面")
+                return self._create_page(properties, database_id)
+            
+            if database_id is None:
+                database_id = config.notion_database_id
             
             # 如果强制创建，跳过查重
             if force_create:
-                self.logger.info("🚀 强制创建模式，跳过查重")
-                return await self._create_page_async(properties, database_id)
-            
-            # 异步查询现有页面
-            self.logger.info(f"🔍 异步查询现有页面，URL: {url}")
-            existing_pages = await self._query_pages_by_url_async(url, database_id)
-            
-            if existing_pages:
-                # 找到现有页面，执行更新
-                page_id = existing_pages[0].get("id")
-                self.logger.info(f"📋 找到现有页面 {len(existing_pages)} 个，将异步更新第一个: {page_id}")
-                return await self._update_page_async(page_id, properties)
+                logger.info("🚀 强制创建模式，跳过查重")
+                result = self._create_page(properties, database_id, url)
             else:
-                # 没有找到现有页面，创建新页面
-                self.logger.info("📝 未找到现有页面，将异步创建新页面")
-                return await self._create_page_async(properties, database_id)
+                result = self._upsert_existing(url, properties, database_id)
+            
+            # 记录URL对应的页面，后续同URL写入可直接更新
+            if result.success and result.page_id:
+                self._cache_page_id(database_id, url, result.page_id)
+            return result
                 
         except Exception as e:
-            error_msg = f"异步Upsert操作异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            error_msg = f"Upsert操作异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
-                operation=WriteOperation.CREATE,
+                operation=WriteOperation.CREATE,  # 默认操作类型
+                url=_extract_url(properties),
                 error_message=error_msg
             )
     
-    async def batch_upsert_async(self, items: List[Dict[str, Any]], database_id: Optional[str] = None,
-                                force_create: bool = False, max_concurrent: int = 3) -> List[WriteResult]:
-        """异步批量写入"""
-        self.logger.info(f"🚀 开始异步批量写入，共 {len(items)} 个项目，最大并发数: {max_concurrent}")
+    def _upsert_existing(self, url: str, properties: Dict[str, Any], database_id: str) -> WriteResult:
+        """按URL查重后更新或创建页面"""
+        # 命中URL缓存时直接更新；页面已被删除则清除缓存并重新查询，其他失败直接返回
+        cached_page_id = self._get_cached_page_id(database_id, url)
+        if cached_page_id:
+            logger.info("⚡ 命中URL缓存，直接更新页面: %s", cached_page_id)
+            result = self._update_page(cached_page_id, properties, url, missing_ok=True)
+            if result is not None:
+                return result
+            self._evict_page_id(cached_page_id)
         
-        # 使用信号量控制并发
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # 查询现有页面
+        logger.info("🔍 查询现有页面，URL: %s", url)
+        page_id = self._query_page_id_by_url(url, database_id)
         
-        async def process_item(i: int, properties: Dict[str, Any]) -> WriteResult:
-            async with semaphore:
-                self.logger.info(f"📋 异步处理第 {i + 1}/{len(items)} 个项目...")
-                return await self.upsert_async(properties, database_id, force_create)
-        
-        # 并发执行所有写入操作
-        tasks = [process_item(i, properties) for i, properties in enumerate(items)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 处理异常结果
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                error_result = WriteResult(
-                    success=False,
-                    operation=WriteOperation.CREATE,
-                    error_message=f"异步批量写入异常: {result}"
+        if page_id:
+            # 找到现有页面，执行更新
+            logger.info("📋 找到现有页面，将更新: %s", page_id)
+            return self._update_page(page_id, properties, url)
+        else:
+            # 没有找到现有页面，创建新页面
+            logger.info("📝 未找到现有页面，将创建新页面")
+            return self._create_page(properties, database_id, url)
+    
+    def batch_upsert(self, items: List[Dict[str, Any]], database_id: Optional[str] = None,
+                    force_create: bool = False, max_concurrent: int = 3) -> List[WriteResult]:
+        """
+        批量写入
+        
+        内部把写入提交到后台线程的常驻事件循环，由AsyncNotionWriter并发执行
+        （信号量限制并发数），调用方式保持同步；调用线程中是否已有运行中的事件循环均可使用。
+        
+        Args:
+            items: 要写入的属性列表（可带 "_page_id" 键指明已知页面ID，跳过查重）
+            database_id: 数据库ID
+            force_create: 强制创建新页面
+            max_concurrent: 最大并发数
+            
+        Returns:
+            List[WriteResult]: 写入结果列表（与items顺序一致）
+        """
+        # 在常驻后台事件循环中执行，异步写入器及其连接池跨批次复用
+        if self._async_writer is None:
+            self._async_writer = AsyncNotionWriter()
+        return _loop_thread.submit(
+            self._async_writer.batch_upsert_async(items, database_id, force_create, max_concurrent)
+        ).result()
+    
+    def delete_page(self, page_id: str) -> WriteResult:
+        """
+        删除页面（移动到垃圾桶）
+        
+        Args:
+            page_id: 页面ID
+            
+        Returns:
+            WriteResult: 操作结果
+        """
+        start_time = time.perf_counter()
+        
+        payload = {
+            "archived": True
+        }
+        
+        update_url = f"{self._pages_url}/{page_id}"
+        
+        try:
+            logger.info("🗑️ 删除页面 %s...", page_id)
+            
+            response = self._make_request("PATCH", update_url, json=payload)
+            processing_time = time.perf_counter() - start_time
+            
+            if response.ok:
+                self._evict_page_id(page_id)
+                logger.info("✅ 页面删除成功，Page ID: %s", page_id)
+                
+                return WriteResult(
+                    success=True,
+                    operation=WriteOperation.UPDATE,  # 删除实际上是更新archived状态
+                    page_id=page_id,
+                    processing_time=processing_time
                 )
-                processed_results.append(error_result)
             else:
-                processed_results.append(result)
-        
-        # 统计结果
-        success_count = sum(1 for r in processed_results if r.success)
-        create_count = sum(1 for r in processed_results if r.operation == WriteOperation.CREATE and r.success)
-        update_count = sum(1 for r in processed_results if r.operation == WriteOperation.UPDATE and r.success)
+                error_msg = f"删除页面失败: {response.status_code} - {response.text}"
+                logger.error("❌ %s", error_msg)
+                
+                return WriteResult(
+                    success=False,
+                    operation=WriteOperation.UPDATE,
+                    page_id=page_id,
+                    error_message=error_msg,
+                    processing_time=processing_time
+                )
+                
+        except Exception as e:
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"删除页面异常: {e}"
+            logger.error("❌ %s", error_msg)
+            
+            return WriteResult(
+                success=False,
+                operation=WriteOperation.UPDATE,
+                page_id=page_id,
+                error_message=error_msg,
+                processing_time=processing_time
+            )
+    
+    def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取页面详情
         
-        self.logger.info(f"✅ 异步批量写入完成，成功: {success_count}/{len(items)}")
-        self.logger.info(f"📊 操作统计 - 创建: {create_count}, 更新: {update_count}")
+        Args:
+            page_id: 页面ID
+            
+        Returns:
+            页面数据或None
+        """
+        get_url = f"{self._pages_url}/{page_id}"
         
-        return processed_results
+        try:
+            response = self._make_request("GET", get_url)
+            
+            if response.ok:
+                return orjson.loads(response.content)
+            else:
+                logger.error("获取页面失败: %d - %s", response.status_code, response.text)
+                return None
+                
+        except Exception as e:
+            logger.error("获取页面异常: %s", e)
+            return None
     
-    async def test_connection_async(self) -> bool:
-        """测试异步Notion API连接"""
+    def test_connection(self) -> bool:
+        """测试Notion API连接"""
         try:
-            self.logger.info("🔗 测试异步Notion API连接...")
+            logger.info("🔗 测试Notion API连接...")
             
             # 尝试获取数据库信息
             database_id = config.notion_database_id
             test_url = f"{self.base_url}/databases/{database_id}"
             
-            response = await self._make_request_async("GET", test_url)
+            response = self._make_request("GET", test_url)
             
-            if response.status_code == 200:
-                self.logger.info("✅ 异步Notion API连接正常")
+            if response.ok:
+                logger.info("✅ Notion API连接正常")
                 return True
             else:
-                self.logger.error(f"❌ 异步Notion API连接异常: {response.status_code}")
+                logger.error("❌ Notion API连接异常: %d", response.status_code)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"❌ 异步Notion API连接失败: {e}")
+            logger.error("❌ Notion API连接失败: %s", e)
             return False
 
-# 继续同步版本的_make_request方法
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """发起HTTP请求"""
-        try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
-            return response
-        except requests.exceptions.RequestException as e:
-            raise NotionWriterError(f"请求失败: {e}")
+
+class AsyncNotionWriter:
+    """异步Notion数据库写入器"""
     
-    def _query_pages_by_url(self, url: str, database_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def __init__(self, pool_size: int = 100, keepalive: int = 20):
         """
-        根据URL查询现有页面
+        初始化异步NotionWriter
         
         Args:
-            url: 要查询的URL
-            database_id: 数据库ID，默认使用配置中的ID
-            
-        Returns:
-            匹配的页面列表
+            pool_size: 连接池最大连接数
+            keepalive: 保持keep-alive的空闲连接数（应不小于批量写入的并发数）
         """
+        self.base_url = "https://api.notion.com/v1"
+        # 常用请求路径预先拼好，逐项写入时不再重复构建
+        self._pages_url = f"{self.base_url}/pages"
+        self._query_url_tmpl = self.base_url + "/databases/%s/query"
+        self.headers = _build_headers()
+        
+        # 异步HTTP客户端绑定创建时的事件循环，因此在首次请求时于当前循环内延迟创建
+        self._limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=keepalive)
+        self.client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # 进程内共享的令牌桶
+        self._bucket = _request_bucket
+        
+        # (database_id, url) → page_id 与 page_id → 属性摘要 的缓存（与同步写入器共享）
+        self._url_cache = _shared_page_ids
+        self._page_digests = _shared_page_digests
+    
+    def _evict_page_id(self, page_id: str) -> None:
+        """从URL缓存和内容摘要缓存中移除该页面"""
+        self._url_cache.evict_value(page_id)
+        self._page_digests.pop(page_id)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        获取当前事件循环可用的异步客户端
+        
+        首次调用、客户端已关闭或事件循环已更换（如多次asyncio.run）时重新创建。
+        创建过程中没有await，同一循环内的并发协程不会重复创建。
+        """
+        loop = asyncio.get_running_loop()
+        stale_loop = self._client_loop is not None and self._client_loop is not loop
+        if self.client is None or self.client.is_closed or stale_loop:
+            # HTTP/2在单条连接上多路复用并发请求，减少握手与队头阻塞
+            self.client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=self._limits,
+                headers=dict(self.headers),
+                event_hooks={"response": [_log_error_response]}
+            )
+            self._client_loop = loop
+        return self.client
+    
+    async def aclose(self) -> None:
+        """关闭异步HTTP客户端（可重复调用）"""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
+        self.client = None
+        self._client_loop = None
+    
+    async def _make_request_async(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        异步HTTP请求
+        
+        429按Retry-After与指数退避重试；5xx与连接错误仅对幂等方法重试。
+        """
+        max_retries = config.max_retries
+        if "json" in kwargs:
+            kwargs["content"] = orjson.dumps(kwargs.pop("json"))
+        retryable = method.upper() in _RETRY_METHODS
+        client = self._get_client()
+        
+        for attempt in range(max_retries + 1):
+            await self._bucket.acquire_async()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if not retryable or attempt == max_retries:
+                    raise NotionWriterError(f"异步请求失败: {e}")
+                delay = _backoff_delay({}, attempt)
+                logger.warning("⏳ 异步请求连接异常，%.2f秒后重试 (%d/%d): %s", delay, attempt + 1, max_retries, e)
+                await asyncio.sleep(delay)
+                continue
+            except httpx.RequestError as e:
+                raise NotionWriterError(f"异步请求失败: {e}")
+            
+            status = response.status_code
+            if attempt == max_retries or not (status == 429 or (retryable and status in _RETRY_STATUS)):
+                return response
+            
+            delay = _backoff_delay(response.headers, attempt)
+            logger.warning("⏳ 异步请求返回%d，%.2f秒后重试 (%d/%d)", status, delay, attempt + 1, max_retries)
+            await asyncio.sleep(delay)
+    
+    async def _query_pages_by_url_async(self, url: str, database_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """异步根据URL查询现有页面"""
         if database_id is None:
             database_id = config.notion_database_id
         
         # 构建查询条件
         query_filter = {
-            "property": "URL",  # 假设URL字段名为URL
-            "url": {
-                "equals": url
-            }
+            "property": "URL",
+            "url": {"equals": url}
         }
         
         query_payload = {
             "filter": query_filter,
-            "page_size": 10  # 限制返回数量
+            "page_size": 10
         }
         
-        query_url = f"{self.base_url}/databases/{database_id}/query"
+        query_url = self._query_url_tmpl % database_id
         
         try:
-            response = self._make_request("POST", query_url, json=query_payload)
+            response = await self._make_request_async("POST", query_url, json=query_payload)
             
-            if response.ok:
-                data = response.json()
-                return data.get("results", [])
-            else:
-                self.logger.warning(f"查询页面失败: {response.status_code} - {response.text}")
+            # 失败响应已由客户端响应钩子统一记录
+            if response.status_code != 200:
                 return []
+            return orjson.loads(response.content).get("results", [])
                 
         except Exception as e:
-            self.logger.error(f"查询页面异常: {e}")
+            logger.error("异步查询页面异常: %s", e)
             return []
     
-    def _create_page(self, properties: Dict[str, Any], database_id: Optional[str] = None) -> WriteResult:
+    async def _query_pages_by_urls_async(self, urls: List[str], database_id: str) -> Optional[Dict[str, str]]:
         """
-        创建新页面
+        异步使用or组合过滤条件批量查询现有页面
+        
+        每 _BULK_QUERY_CHUNK 个URL一组，各组并发查询（组内自动翻页）。
         
-        Args:
-            properties: 页面属性
-            database_id: 数据库ID
-            
         Returns:
-            WriteResult: 写入结果
+            URL → page_id 映射（同一URL有多个页面时取第一个）；任一查询失败时返回None
         """
-        start_time = time.time()
+        query_url = self._query_url_tmpl % database_id
+        
+        async def query_chunk(chunk: List[str]) -> Optional[List[Dict[str, Any]]]:
+            query_payload: Dict[str, Any] = {
+                "filter": {"or": [{"property": "URL", "url": {"equals": u}} for u in chunk]},
+                "page_size": 100
+            }
+            pages: List[Dict[str, Any]] = []
+            while True:
+                try:
+                    response = await self._make_request_async("POST", query_url, json=query_payload)
+                except Exception as e:
+                    logger.error("异步批量查询页面异常: %s", e)
+                    return None
+                
+                if response.status_code != 200:
+                    return None
+                
+                data = orjson.loads(response.content)
+                pages.extend(data.get("results", []))
+                if not (data.get("has_more") and data.get("next_cursor")):
+                    return pages
+                query_payload["start_cursor"] = data["next_cursor"]
+        
+        chunks = [urls[i:i + _BULK_QUERY_CHUNK] for i in range(0, len(urls), _BULK_QUERY_CHUNK)]
+        found: Dict[str, str] = {}
+        for pages in await asyncio.gather(*(query_chunk(chunk) for chunk in chunks)):
+            if pages is None:
+                return None
+            for page in pages:
+                page_url = page.get("properties", {}).get("URL", {}).get("url")
+                if page_url and page_url not in found and page.get("id"):
+                    found[page_url] = page["id"]
+        return found
+    
+    async def _create_page_async(self, properties: Dict[str, Any], database_id: Optional[str] = None,
+                                 url_hint: Optional[str] = None) -> WriteResult:
+        """异步创建新页面"""
+        start_time = time.perf_counter()
         
         if database_id is None:
             database_id = config.notion_database_id
         
-        payload = {
-            "parent": {"database_id": database_id},
-            "properties": properties
-        }
-        
-        create_url = f"{self.base_url}/pages"
+        body = _create_page_body(database_id, properties)
+        create_url = self._pages_url
         
         try:
-            self.logger.info(f"📝 创建新页面...")
+            logger.info("📝 异步创建新页面...")
             
-            response = self._make_request("POST", create_url, json=payload)
-            processing_time = time.time() - start_time
+            response = await self._make_request_async("POST", create_url, content=body)
+            processing_time = time.perf_counter() - start_time
             
-            if response.ok:
-                data = response.json()
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
                 page_id = data.get("id")
                 
-                # 尝试获取URL
-                url = None
-                if "URL" in properties and "url" in properties["URL"]:
-                    url = properties["URL"]["url"]
+                url = url_hint if url_hint is not None else _extract_url(properties)
+                if page_id:
+                    self._page_digests.put(page_id, _properties_digest(properties))
                 
-                self.logger.info(f"✅ 页面创建成功，Page ID: {page_id}")
+                logger.info("✅ 异步页面创建成功，Page ID: %s", page_id)
                 
                 return WriteResult(
                     success=True,
@@ -474,8 +1014,8 @@ class AsyncNotionWriter:
                     processing_time=processing_time
                 )
             else:
-                error_msg = f"创建页面失败: {response.status_code} - {response.text}"
-                self.logger.error(f"❌ {error_msg}")
+                # 失败响应已由客户端响应钩子统一记录，这里只填充结果中的错误信息
+                error_msg = f"异步创建页面失败: {response.status_code} - {response.text}"
                 
                 return WriteResult(
                     success=False,
@@ -485,9 +1025,9 @@ class AsyncNotionWriter:
                 )
                 
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"创建页面异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"异步创建页面异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
@@ -496,40 +1036,45 @@ class AsyncNotionWriter:
                 processing_time=processing_time
             )
     
-    def _update_page(self, page_id: str, properties: Dict[str, Any]) -> WriteResult:
+    async def _update_page_async(self, page_id: str, properties: Dict[str, Any],
+                                 url_hint: Optional[str] = None,
+                                 missing_ok: bool = False) -> Optional[WriteResult]:
         """
-        更新现有页面
+        异步更新现有页面（属性与上次成功写入的内容一致时跳过PATCH）
         
-        Args:
-            page_id: 页面ID
-            properties: 要更新的属性
-            
-        Returns:
-            WriteResult: 写入结果
+        missing_ok 的含义与同步版 NotionWriter._update_page 相同。
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        digest = _properties_digest(properties)
+        if self._page_digests.get(page_id) == digest:
+            logger.info("⏭️ 页面内容未变化，跳过异步更新: %s", page_id)
+            return WriteResult(
+                success=True,
+                operation=WriteOperation.SKIP,
+                page_id=page_id,
+                url=url_hint if url_hint is not None else _extract_url(properties),
+                processing_time=0.0,
+                existing_page_found=True
+            )
         
         payload = {
             "properties": properties
         }
         
-        update_url = f"{self.base_url}/pages/{page_id}"
+        update_url = f"{self._pages_url}/{page_id}"
         
         try:
-            self.logger.info(f"🔄 更新页面 {page_id}...")
+            logger.info("🔄 异步更新页面 %s...", page_id)
             
-            response = self._make_request("PATCH", update_url, json=payload)
-            processing_time = time.time() - start_time
+            response = await self._make_request_async("PATCH", update_url, json=payload)
+            processing_time = time.perf_counter() - start_time
             
-            if response.ok:
-                data = response.json()
-                
-                # 尝试获取URL
-                url = None
-                if "URL" in properties and "url" in properties["URL"]:
-                    url = properties["URL"]["url"]
+            if response.status_code == 200:
+                url = url_hint if url_hint is not None else _extract_url(properties)
+                self._page_digests.put(page_id, digest)
                 
-                self.logger.info(f"✅ 页面更新成功，Page ID: {page_id}")
+                logger.info("✅ 异步页面更新成功，Page ID: %s", page_id)
                 
                 return WriteResult(
                     success=True,
@@ -540,8 +1085,12 @@ class AsyncNotionWriter:
                     existing_page_found=True
                 )
             else:
-                error_msg = f"更新页面失败: {response.status_code} - {response.text}"
-                self.logger.error(f"❌ {error_msg}")
+                if missing_ok and _page_missing(response.status_code, response.content):
+                    logger.info("🔍 页面已不存在: %s", page_id)
+                    return None
+                
+                # 失败响应已由客户端响应钩子统一记录，这里只填充结果中的错误信息
+                error_msg = f"异步更新页面失败: {response.status_code} - {response.text}"
                 
                 return WriteResult(
                     success=False,
@@ -553,9 +1102,9 @@ class AsyncNotionWriter:
                 )
                 
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"更新页面异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            processing_time = time.perf_counter() - start_time
+            error_msg = f"异步更新页面异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
@@ -566,198 +1115,208 @@ class AsyncNotionWriter:
                 existing_page_found=True
             )
     
-    def upsert(self, properties: Dict[str, Any], database_id: Optional[str] = None,
-               force_create: bool = False) -> WriteResult:
+    async def upsert_async(self, properties: Dict[str, Any], database_id: Optional[str] = None,
+                          force_create: bool = False, page_id: Optional[str] = None) -> WriteResult:
         """
-        幂等写入（创建或更新）
+        异步幂等写入（创建或更新）
         
-        Args:
-            properties: 页面属性
-            database_id: 数据库ID
-            force_create: 强制创建新页面，不检查重复
-            
-        Returns:
-            WriteResult: 写入结果
+        page_id 的含义与同步版 NotionWriter.upsert 相同：提供时跳过查重直接更新，
+        页面已不存在时回退为按URL查重后更新或创建，其他失败直接返回。
         """
         try:
             # 获取URL用于查重
-            url = None
-            if "URL" in properties and "url" in properties["URL"]:
-                url = properties["URL"]["url"]
+            url = _extract_url(properties)
+            
+            if page_id and not force_create:
+                logger.info("⚡ 已知页面ID，直接异步更新页面: %s", page_id)
+                result = await self._update_page_async(page_id, properties, url, missing_ok=True)
+                if result is not None:
+                    if result.success and url:
+                        self._url_cache.put((database_id or config.notion_database_id, url), page_id)
+                    return result
+                self._evict_page_id(page_id)
             
             if not url:
-                self.logger.warning("⚠️ 没有URL字段，无法查重，将创建新页面")
-                return self._create_page(properties, database_id)
+                logger.warning("⚠️ 没有URL字段，无法查重，将异步创建新页面")
+                return await self._create_page_async(properties, database_id)
+            
+            if database_id is None:
+                database_id = config.notion_database_id
             
             # 如果强制创建，跳过查重
             if force_create:
-                self.logger.info("🚀 强制创建模式，跳过查重")
-                return self._create_page(properties, database_id)
-            
-            # 查询现有页面
-            self.logger.info(f"🔍 查询现有页面，URL: {url}")
-            existing_pages = self._query_pages_by_url(url, database_id)
-            
-            if existing_pages:
-                # 找到现有页面，执行更新
-                page_id = existing_pages[0].get("id")
-                self.logger.info(f"📋 找到现有页面 {len(existing_pages)} 个，将更新第一个: {page_id}")
-                return self._update_page(page_id, properties)
+                logger.info("🚀 强制创建模式，跳过查重")
+                result = await self._create_page_async(properties, database_id, url)
             else:
-                # 没有找到现有页面，创建新页面
-                self.logger.info("📝 未找到现有页面，将创建新页面")
-                return self._create_page(properties, database_id)
+                result = await self._upsert_existing_async(url, properties, database_id)
+            
+            # 记录URL对应的页面，后续同URL写入可直接更新
+            if result.success and result.page_id:
+                self._url_cache.put((database_id, url), result.page_id)
+            return result
                 
         except Exception as e:
-            error_msg = f"Upsert操作异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            error_msg = f"异步Upsert操作异常: {e}"
+            logger.error("❌ %s", error_msg)
             
             return WriteResult(
                 success=False,
-                operation=WriteOperation.CREATE,  # 默认操作类型
+                operation=WriteOperation.CREATE,
+                url=_extract_url(properties),
                 error_message=error_msg
             )
     
-    def batch_upsert(self, items: List[Dict[str, Any]], database_id: Optional[str] = None,
-                    force_create: bool = False) -> List[WriteResult]:
-        """
-        批量写入
-        
-        Args:
-            items: 要写入的属性列表
-            database_id: 数据库ID
-            force_create: 强制创建新页面
-            
-        Returns:
-            List[WriteResult]: 写入结果列表
-        """
-        results = []
-        
-        self.logger.info(f"🚀 开始批量写入，共 {len(items)} 个项目")
-        
-        for i, properties in enumerate(items):
-            self.logger.info(f"📋 处理第 {i + 1}/{len(items)} 个项目...")
-            
-            result = self.upsert(properties, database_id, force_create)
-            results.append(result)
-            
-            # 批量处理间隔，避免API限流
-            if i < len(items) - 1:
-                time.sleep(0.5)
-        
-        # 统计结果
-        success_count = sum(1 for r in results if r.success)
-        create_count = sum(1 for r in results if r.operation == WriteOperation.CREATE and r.success)
-        update_count = sum(1 for r in results if r.operation == WriteOperation.UPDATE and r.success)
+    async def _upsert_existing_async(self, url: str, properties: Dict[str, Any], database_id: str) -> WriteResult:
+        """异步按URL查重后更新或创建页面"""
+        # 命中URL缓存时直接更新；页面已被删除则清除缓存并重新查询，其他失败直接返回
+        cached_page_id = self._url_cache.get((database_id, url))
+        if cached_page_id:
+            logger.info("⚡ 命中URL缓存，直接异步更新页面: %s", cached_page_id)
+            result = await self._update_page_async(cached_page_id, properties, url, missing_ok=True)
+            if result is not None:
+                return result
+            self._evict_page_id(cached_page_id)
         
-        self.logger.info(f"✅ 批量写入完成，成功: {success_count}/{len(items)}")
-        self.logger.info(f"📊 操作统计 - 创建: {create_count}, 更新: {update_count}")
+        # 异步查询现有页面
+        logger.info("🔍 异步查询现有页面，URL: %s", url)
+        existing_pages = await self._query_pages_by_url_async(url, database_id)
         
-        return results
+        if existing_pages:
+            # 找到现有页面，执行更新
+            page_id = existing_pages[0].get("id")
+            logger.info("📋 找到现有页面 %d 个，将异步更新第一个: %s", len(existing_pages), page_id)
+            return await self._update_page_async(page_id, properties, url)
+        else:
+            # 没有找到现有页面，创建新页面
+            logger.info("📝 未找到现有页面，将异步创建新页面")
+            return await self._create_page_async(properties, database_id, url)
     
-    def delete_page(self, page_id: str) -> WriteResult:
+    async def batch_upsert_stream(self, items: List[Dict[str, Any]], database_id: Optional[str] = None,
+                                  force_create: bool = False,
+                                  max_concurrent: int = 3) -> AsyncIterator[Tuple[int, WriteResult]]:
         """
-        删除页面（移动到垃圾桶）
+        异步批量写入，按完成顺序逐个产出结果
         
-        Args:
-            page_id: 页面ID
-            
-        Returns:
-            WriteResult: 操作结果
+        调用方可在写入进行中处理已完成的结果（打印进度、记录检查点等），
+        无需等待最慢的一项。提前退出迭代时，尚未完成的写入会被取消。
+        
+        项中可带 "_page_id" 键指明已知页面ID，该项跳过查重直接更新（该键不会写入Notion）。
+        
+        Yields:
+            (items中的下标, WriteResult)
         """
-        start_time = time.time()
+        # 使用信号量控制并发
+        semaphore = asyncio.Semaphore(max_concurrent)
         
-        payload = {
-            "archived": True
-        }
+        # 先批量查重，再逐项直接创建或更新（批量查询失败时回退为逐项upsert）
+        existing_pages: Optional[Dict[str, str]] = None
+        if not force_create:
+            if database_id is None:
+                database_id = config.notion_database_id
+            urls = [
+                _extract_url(properties) for properties in items
+                if not properties.get(_PAGE_ID_KEY) and _extract_url(properties)
+            ]
+            existing_pages = await self._query_pages_by_urls_async(urls, database_id)
         
-        update_url = f"{self.base_url}/pages/{page_id}"
+        async def write_item(i: int, properties: Dict[str, Any]) -> WriteResult:
+            async with semaphore:
+                logger.debug("📋 异步处理第 %d/%d 个项目...", i + 1, len(items))
+                # 无论取值是否为空都要去掉该键，否则会被当作属性发送给Notion
+                if _PAGE_ID_KEY in properties:
+                    properties = dict(properties)
+                    known_page_id = properties.pop(_PAGE_ID_KEY)
+                else:
+                    known_page_id = None
+                if known_page_id:
+                    return await self.upsert_async(properties, database_id, force_create, page_id=known_page_id)
+                if existing_pages is None:
+                    return await self.upsert_async(properties, database_id, force_create)
+                url = _extract_url(properties)
+                page_id = existing_pages.get(url) if url else None
+                if page_id:
+                    result = await self._update_page_async(page_id, properties, url)
+                else:
+                    result = await self._create_page_async(properties, database_id, url)
+                if url and result.success and result.page_id:
+                    self._url_cache.put((database_id, url), result.page_id)
+                return result
         
-        try:
-            self.logger.info(f"🗑️ 删除页面 {page_id}...")
-            
-            response = self._make_request("PATCH", update_url, json=payload)
-            processing_time = time.time() - start_time
-            
-            if response.ok:
-                self.logger.info(f"✅ 页面删除成功，Page ID: {page_id}")
-                
-                return WriteResult(
-                    success=True,
-                    operation=WriteOperation.UPDATE,  # 删除实际上是更新archived状态
-                    page_id=page_id,
-                    processing_time=processing_time
-                )
-            else:
-                error_msg = f"删除页面失败: {response.status_code} - {response.text}"
-                self.logger.error(f"❌ {error_msg}")
-                
-                return WriteResult(
+        async def process_item(i: int, properties: Dict[str, Any]) -> Tuple[int, WriteResult]:
+            # 异常就地转换为带URL的失败结果，调用方可据此只重试失败项
+            try:
+                return i, await write_item(i, properties)
+            except Exception as e:
+                url = _extract_url(properties)
+                logger.error("❌ 异步批量写入第 %d 项异常 (URL: %s): %r", i + 1, url, e)
+                return i, WriteResult(
                     success=False,
-                    operation=WriteOperation.UPDATE,
-                    page_id=page_id,
-                    error_message=error_msg,
-                    processing_time=processing_time
+                    operation=WriteOperation.CREATE,
+                    url=url,
+                    error_message=f"异步批量写入异常: {e!r}"
                 )
-                
-        except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"删除页面异常: {e}"
-            self.logger.error(f"❌ {error_msg}")
-            
-            return WriteResult(
-                success=False,
-                operation=WriteOperation.UPDATE,
-                page_id=page_id,
-                error_message=error_msg,
-                processing_time=processing_time
-            )
+        
+        tasks = [asyncio.ensure_future(process_item(i, properties)) for i, properties in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
     
-    def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+    async def batch_upsert_async(self, items: List[Dict[str, Any]], database_id: Optional[str] = None,
+                                force_create: bool = False, max_concurrent: int = 3) -> List[WriteResult]:
         """
-        获取页面详情
+        异步批量写入（结果与items顺序一致）
         
-        Args:
-            page_id: 页面ID
-            
-        Returns:
-            页面数据或None
+        同一URL的多个项先合并为一次写入（后出现的属性覆盖先出现的），避免对同一页面
+        并发查询和写入造成重复建页；重复项共享同一结果。强制创建模式保持逐项创建。
         """
-        get_url = f"{self.base_url}/pages/{page_id}"
+        logger.info("🚀 开始异步批量写入，共 %d 个项目，最大并发数: %s", len(items), max_concurrent)
         
-        try:
-            response = self._make_request("GET", get_url)
-            
-            if response.ok:
-                return response.json()
-            else:
-                self.logger.error(f"获取页面失败: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"获取页面异常: {e}")
-            return None
+        if force_create:
+            unique_items, mapping = items, list(range(len(items)))
+        else:
+            unique_items, mapping = _dedupe_by_url(items)
+            if len(unique_items) < len(items):
+                logger.info("🔗 合并重复URL %d 个", len(items) - len(unique_items))
+        
+        unique_results: List[Optional[WriteResult]] = [None] * len(unique_items)
+        async for i, result in self.batch_upsert_stream(unique_items, database_id, force_create, max_concurrent):
+            unique_results[i] = result
+        
+        # 按原始顺序展开结果
+        results = [unique_results[idx] for idx in mapping]
+        
+        # 统计结果
+        success_count, create_count, update_count, skip_count = _count_results(results)
+        
+        logger.info("✅ 异步批量写入完成，成功: %d/%d", success_count, len(items))
+        logger.info("📊 操作统计 - 创建: %d, 更新: %d, 跳过: %d", create_count, update_count, skip_count)
+        
+        return results
     
-    def test_connection(self) -> bool:
-        """测试Notion API连接"""
+    async def test_connection_async(self) -> bool:
+        """测试异步Notion API连接"""
         try:
-            self.logger.info("🔗 测试Notion API连接...")
+            logger.info("🔗 测试异步Notion API连接...")
             
             # 尝试获取数据库信息
             database_id = config.notion_database_id
             test_url = f"{self.base_url}/databases/{database_id}"
             
-            response = self._make_request("GET", test_url)
+            response = await self._make_request_async("GET", test_url)
             
-            if response.ok:
-                self.logger.info("✅ Notion API连接正常")
+            if response.status_code == 200:
+                logger.info("✅ 异步Notion API连接正常")
                 return True
             else:
-                self.logger.error(f"❌ Notion API连接异常: {response.status_code}")
+                logger.error("❌ 异步Notion API连接异常: %d", response.status_code)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"❌ Notion API连接失败: {e}")
+            logger.error("❌ 异步Notion API连接失败: %s", e)
             return False
 
 
@@ -788,3 +1347,19 @@ def test_notion_connection() -> bool:
 async def test_notion_connection_async() -> bool:
     """便捷函数：测试异步Notion连接"""
     return await async_notion_writer.test_connection_async()
+
+
+async def shutdown_async() -> None:
+    """
+    便捷函数：关闭全局异步写入器持有的连接
+    
+    异步客户端绑定所在的事件循环，建议整个程序只调用一次 asyncio.run(main())，
+    并在退出前（或应用生命周期的关闭阶段）调用本函数::
+    
+        async def main():
+            try:
+                await write_to_notion_async(properties)
+            finally:
+                await shutdown_async()
+    """
+    await async_notion_writer.aclose()
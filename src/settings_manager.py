@@ -5,11 +5,14 @@
 
 import os
 import json
+import atexit
+import functools
 import logging
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
-import configparser
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, fields, replace
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,32 @@ class UserSettings:
         return cls(**data)
 
 
+# UserSettings 的字段名集合
+_FIELDS = frozenset(f.name for f in fields(UserSettings))
+
+# 需要校验的字段（按返回顺序）
+_VALIDATE_FIELDS = (
+    'qwen_api_key',
+    'notion_api_key',
+    'notion_database_id',
+    'feishu_app_id',
+    'feishu_app_secret',
+    'feishu_app_token',
+    'feishu_table_id',
+)
+
+# 各字段对应的后备环境变量
+_ENV_MAP = {
+    'qwen_api_key': 'DASHSCOPE_API_KEY',
+    'notion_api_key': 'NOTION_TOKEN',
+    'notion_database_id': 'NOTION_DATABASE_ID',
+    'feishu_app_id': 'FEISHU_APP_ID',
+    'feishu_app_secret': 'FEISHU_APP_SECRET',
+    'feishu_app_token': 'FEISHU_APP_TOKEN',
+    'feishu_table_id': 'FEISHU_TABLE_ID',
+}
+
+
 class SettingsManager:
     """设置管理器"""
     
@@ -50,50 +79,70 @@ class SettingsManager:
             project_root = Path(__file__).parent.parent
             config_dir = project_root / "config"
             config_dir.mkdir(exist_ok=True)
-            config_file = config_dir / "user_settings.ini"
+            config_file = config_dir / "user_settings.json"
+        
+        self.config_file = Path(config_file).with_suffix('.json')
+        # 内存缓存: (配置文件 mtime_ns, 设置)，文件未变化时跳过重新解析
+        self._cache: Optional[Tuple[int, UserSettings]] = None
+        
+        # 合并写入: 短时间内的多次更新先缓冲在内存中，延迟后一次性落盘
+        self._pending: Dict[str, Any] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._pending_lock = threading.Lock()
+        atexit.register(self.flush)
         
-        self.config_file = Path(config_file)
-        self.config = configparser.ConfigParser()
+        # 迁移旧版 INI 配置
+        self._migrate_from_ini()
         
         # 确保配置文件存在
         self._ensure_config_file()
     
+    def _migrate_from_ini(self):
+        """将旧版 INI 配置文件一次性迁移为 JSON"""
+        ini_file = self.config_file.with_suffix('.ini')
+        if self.config_file.exists() or not ini_file.exists():
+            return
+        
+        import configparser
+        
+        try:
+            parser = configparser.ConfigParser()
+            parser.read(ini_file, encoding='utf-8')
+            settings = UserSettings(**{
+                name: parser.get('DEFAULT', name, fallback='')
+                for name in _FIELDS
+            })
+            if self.save_settings(settings):
+                logger.info(f"已将旧版配置迁移到: {self.config_file}")
+        except Exception as e:
+            logger.error(f"迁移旧版配置失败: {e}")
+    
     def _ensure_config_file(self):
         """确保配置文件存在"""
         if not self.config_file.exists():
             # 创建默认配置文件
-            self.config['DEFAULT'] = {
-                'qwen_api_key': '',
-                'notion_api_key': '',
-                'notion_database_id': '',
-                'feishu_app_id': '',
-                'feishu_app_secret': '',
-                'feishu_app_token': '',
-                'feishu_table_id': ''
-            }
             self.save_settings(UserSettings())
             logger.info(f"创建默认配置文件: {self.config_file}")
     
     def load_settings(self) -> UserSettings:
         """加载用户设置"""
         try:
-            if not self.config_file.exists():
+            try:
+                mtime_ns = self.config_file.stat().st_mtime_ns
+            except FileNotFoundError:
                 logger.warning(f"配置文件不存在: {self.config_file}")
+                self._cache = None
                 return UserSettings()
             
-            self.config.read(self.config_file, encoding='utf-8')
+            cache = self._cache
+            if cache is not None and cache[0] == mtime_ns:
+                return cache[1]
             
-            # 从配置文件读取设置
-            settings = UserSettings(
-                qwen_api_key=self.config.get('DEFAULT', 'qwen_api_key', fallback=''),
-                notion_api_key=self.config.get('DEFAULT', 'notion_api_key', fallback=''),
-                notion_database_id=self.config.get('DEFAULT', 'notion_database_id', fallback=''),
-                feishu_app_id=self.config.get('DEFAULT', 'feishu_app_id', fallback=''),
-                feishu_app_secret=self.config.get('DEFAULT', 'feishu_app_secret', fallback=''),
-                feishu_app_token=self.config.get('DEFAULT', 'feishu_app_token', fallback=''),
-                feishu_table_id=self.config.get('DEFAULT', 'feishu_table_id', fallback='')
+            settings = UserSettings.from_dict(
+                json.loads(self.config_file.read_text(encoding='utf-8'))
             )
             
+            self._cache = (mtime_ns, settings)
             logger.info("用户设置加载成功")
             return settings
             
@@ -102,26 +151,27 @@ class SettingsManager:
             return UserSettings()
     
     def save_settings(self, settings: UserSettings) -> bool:
-        """保存用户设置"""
+        """保存用户设置（先写临时文件再原子替换，避免写入中断导致文件损坏）"""
         try:
             # 确保配置目录存在
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # 更新配置
-            if 'DEFAULT' not in self.config:
-                self.config['DEFAULT'] = {}
-            
-            self.config['DEFAULT']['qwen_api_key'] = settings.qwen_api_key or ''
-            self.config['DEFAULT']['notion_api_key'] = settings.notion_api_key or ''
-            self.config['DEFAULT']['notion_database_id'] = settings.notion_database_id or ''
-            self.config['DEFAULT']['feishu_app_id'] = settings.feishu_app_id or ''
-            self.config['DEFAULT']['feishu_app_secret'] = settings.feishu_app_secret or ''
-            self.config['DEFAULT']['feishu_app_token'] = settings.feishu_app_token or ''
-            self.config['DEFAULT']['feishu_table_id'] = settings.feishu_table_id or ''
-            
-            # 写入文件
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
+            # 每次写入使用唯一的临时文件，避免并发保存互相覆盖或替换到半写文件
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.config_file.parent, prefix=self.config_file.name, suffix='.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(asdict(settings), f, ensure_ascii=False, indent=2)
+                os.replace(tmp_name, self.config_file)
+            except BaseException:
+                # 写入或替换失败时清理残留的临时文件
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+            self._cache = (self.config_file.stat().st_mtime_ns, settings)
             
             logger.info(f"用户设置保存成功: {self.config_file}")
             return True
@@ -133,24 +183,9 @@ class SettingsManager:
     def update_settings(self, updates: Dict[str, Any]) -> UserSettings:
         """更新部分设置"""
         try:
-            # 加载当前设置
-            current_settings = self.load_settings()
-            
-            # 应用更新
-            if 'qwen_api_key' in updates:
-                current_settings.qwen_api_key = updates['qwen_api_key']
-            if 'notion_api_key' in updates:
-                current_settings.notion_api_key = updates['notion_api_key']
-            if 'notion_database_id' in updates:
-                current_settings.notion_database_id = updates['notion_database_id']
-            if 'feishu_app_id' in updates:
-                current_settings.feishu_app_id = updates['feishu_app_id']
-            if 'feishu_app_secret' in updates:
-                current_settings.feishu_app_secret = updates['feishu_app_secret']
-            if 'feishu_app_token' in updates:
-                current_settings.feishu_app_token = updates['feishu_app_token']
-            if 'feishu_table_id' in updates:
-                current_settings.feishu_table_id = updates['feishu_table_id']
+            # 只保留 UserSettings 中存在的字段，基于缓存中的当前设置生成新实例
+            filtered = {key: updates[key] for key in updates.keys() & _FIELDS}
+            current_settings = replace(self.load_settings(), **filtered)
             
             # 保存更新后的设置
             if self.save_settings(current_settings):
@@ -163,37 +198,65 @@ class SettingsManager:
             logger.error(f"更新设置失败: {e}")
             raise
     
+    def queue_update(self, updates: Dict[str, Any], delay: float = 0.25):
+        """
+        缓冲部分设置更新，延迟 delay 秒后合并写入
+        
+        Args:
+            updates: 要更新的字段
+            delay: 合并窗口（秒），窗口内的新更新会重新计时
+        """
+        with self._pending_lock:
+            self._pending.update(updates)
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(delay, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """将缓冲的更新一次性写入"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._flush_timer = None
+        
+        if pending:
+            try:
+                self.update_settings(pending)
+            except Exception as e:
+                logger.error(f"合并写入设置失败: {e}")
+    
+    def flush(self):
+        """立即写入所有缓冲的更新（用于优雅退出）"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+        self._flush()
+    
     def get_effective_settings(self) -> UserSettings:
         """获取有效设置（用户设置优先，环境变量作为后备）"""
         user_settings = self.load_settings()
         
-        # 如果用户设置为空，使用环境变量
-        effective_settings = UserSettings(
-            qwen_api_key=user_settings.qwen_api_key or os.getenv('DASHSCOPE_API_KEY'),
-            notion_api_key=user_settings.notion_api_key or os.getenv('NOTION_TOKEN'),
-            notion_database_id=user_settings.notion_database_id or os.getenv('NOTION_DATABASE_ID'),
-            feishu_app_id=user_settings.feishu_app_id or os.getenv('FEISHU_APP_ID'),
-            feishu_app_secret=user_settings.feishu_app_secret or os.getenv('FEISHU_APP_SECRET'),
-            feishu_app_token=user_settings.feishu_app_token or os.getenv('FEISHU_APP_TOKEN'),
-            feishu_table_id=user_settings.feishu_table_id or os.getenv('FEISHU_TABLE_ID')
-        )
+        # 所有字段都已由用户设置时无需读取环境变量
+        if all(getattr(user_settings, name) for name in _VALIDATE_FIELDS):
+            return user_settings
         
-        return effective_settings
+        # 用户设置为空的字段使用环境变量
+        return UserSettings(**{
+            name: getattr(user_settings, name) or os.getenv(env_name)
+            for name, env_name in _ENV_MAP.items()
+        })
     
     def validate_settings(self, settings: UserSettings) -> Dict[str, bool]:
         """验证设置"""
-        validation_results = {
-            'qwen_api_key': bool(settings.qwen_api_key and len(settings.qwen_api_key) > 10),
-            'notion_api_key': bool(settings.notion_api_key and len(settings.notion_api_key) > 10),
-            'notion_database_id': bool(settings.notion_database_id and len(settings.notion_database_id) > 10),
-            'feishu_app_id': bool(settings.feishu_app_id and len(settings.feishu_app_id) > 10),
-            'feishu_app_secret': bool(settings.feishu_app_secret and len(settings.feishu_app_secret) > 10),
-            'feishu_app_token': bool(settings.feishu_app_token and len(settings.feishu_app_token) > 10),
-            'feishu_table_id': bool(settings.feishu_table_id and len(settings.feishu_table_id) > 10)
+        return {
+            name: (value is not None and len(value) > 10)
+            for name in _VALIDATE_FIELDS
+            for value in (getattr(settings, name),)
         }
-        
-        return validation_results
 
 
-# 全局设置管理器实例
-settings_manager = SettingsManager()
+@functools.lru_cache(maxsize=None)
+def get_settings_manager() -> SettingsManager:
+    """获取全局设置管理器实例（首次调用时创建，导入模块时不访问磁盘）"""
+    return SettingsManager()
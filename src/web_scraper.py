@@ -3,13 +3,42 @@ Web爬虫模块
 使用Playwright进行网页抓取和内容提取
 """
 
+import re
 import asyncio
 import logging
-from typing import Optional
+import threading
+from typing import List, Optional, Union
 from playwright.async_api import async_playwright
 import html2text
 
 
+# 连续空行（含仅由空白组成的行），压缩为一个空行
+_BLANK_RE = re.compile(r'(?:[ \t]*\n){3,}')
+
+# 不影响Markdown输出的资源类型，爬取时直接拦截
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+
+# 在浏览器内移除与正文无关的节点，只返回主体内容的HTML，减小html2text的输入
+_EXTRACT_CONTENT_JS = """() => {
+    for (const sel of ['script', 'style', 'svg', 'noscript', 'iframe', 'link']) {
+        document.querySelectorAll(sel).forEach(e => e.remove());
+    }
+    const root = document.querySelector('main')
+        || document.querySelector('article')
+        || document.body
+        || document.documentElement;
+    return root.innerHTML;
+}"""
+
+
+async def _route_resource(route) -> None:
+    """中止不需要的资源请求，其余请求照常发出"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 class WebScraper:
     """Web爬虫类"""
     
@@ -23,16 +52,71 @@ class WebScraper:
         self.headless = headless
         self.logger = logging.getLogger(__name__)
         
-        # 初始化HTML到Markdown转换器
-        self.h2t = html2text.HTML2Text()
-        self.h2t.ignore_links = False
-        self.h2t.ignore_images = True
-        self.h2t.body_width = 0  # 不限制行宽
+        # HTML到Markdown转换器，每个线程各持有一个（html2text 不可重入）
+        self._h2t_local = threading.local()
         
+        # 共享的浏览器实例，仅在 async with 上下文内有效
+        self._playwright = None
+        self._browser = None
+        self._context_depth = 0
+        # 串行化浏览器启动，避免并发进入上下文时重复启动（首次进入时在事件循环内创建）
+        self._launch_lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def h2t(self) -> html2text.HTML2Text:
+        """当前线程的HTML到Markdown转换器，首次访问时创建并配置"""
+        h2t = getattr(self._h2t_local, 'h2t', None)
+        if h2t is None:
+            h2t = html2text.HTML2Text()
+            h2t.ignore_links = False
+            h2t.ignore_images = True
+            h2t.body_width = 0  # 不限制行宽
+            self._h2t_local.h2t = h2t
+        return h2t
+    
+    async def __aenter__(self) -> 'WebScraper':
+        """启动浏览器，上下文内的多次爬取复用同一个浏览器"""
+        # 先计数再等待，保证启动期间并发进入/退出的协程不会提前关闭浏览器
+        self._context_depth += 1
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is None:
+                try:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                except Exception as e:
+                    # 启动失败时退回到每次调用单独启动浏览器，错误由各次爬取自行记录
+                    self.logger.error(f"启动共享浏览器失败: {e}")
+                    if self._playwright is not None:
+                        await self._playwright.stop()
+                        self._playwright = None
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """关闭浏览器（嵌套使用时仅在最外层退出时关闭）"""
+        self._context_depth -= 1
+        if self._context_depth > 0:
+            return
+        
+        # 锁与事件循环绑定，最外层退出后丢弃，下次进入时重新创建
+        self._launch_lock = None
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        try:
+            if browser is not None:
+                await browser.close()
+        finally:
+            if playwright is not None:
+                await playwright.stop()
+    
     async def scrape_to_markdown(self, url: str, wait_time: int = 2) -> Optional[str]:
         """
         爬取页面并转换为Markdown格式
         
+        存在活动的 async with 上下文时复用共享浏览器，只为每个URL新开一个页面，
+        爬取期间持有上下文引用使浏览器不会被提前关闭；否则为本次调用单独启动并关闭浏览器。
+        
         Args:
             url: 目标URL
             wait_time: 等待时间（秒）
@@ -41,74 +125,92 @@ class WebScraper:
             Markdown格式的页面内容，失败时返回None
         """
         try:
+            if self._context_depth > 0:
+                # 持有一份上下文引用，防止其他协程退出上下文时在爬取中途关闭共享浏览器
+                async with self:
+                    if self._browser is not None:
+                        return await self._scrape_with_browser(self._browser, url, wait_time)
+            
             async with async_playwright() as p:
                 # 启动浏览器
                 browser = await p.chromium.launch(headless=self.headless)
-                page = await browser.new_page()
-                
-                # 设置用户代理
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                })
-                
-                # 访问页面
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                
-                # 等待指定时间，确保动态内容加载
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                
-                # 获取页面HTML内容
-                content = await page.content()
-                
-                # 关闭浏览器
-                await browser.close()
-                
-                # 转换为Markdown
-                markdown = self.h2t.handle(content)
-                
-                # 清理和优化Markdown内容
-                markdown = self._clean_markdown(markdown)
-                
-                self.logger.info(f"成功爬取页面: {url}, 内容长度: {len(markdown)}")
-                return markdown
+                try:
+                    return await self._scrape_with_browser(browser, url, wait_time)
+                finally:
+                    # 关闭浏览器
+                    await browser.close()
                 
         except Exception as e:
             self.logger.error(f"爬取页面失败 {url}: {e}")
             return None
     
-    def _clean_markdown(self, markdown: str) -> str:
+    async def scrape_many(self, urls: List[str], concurrency: int = 8,
+                          wait_time: int = 2) -> List[Union[Optional[str], BaseException]]:
         """
-        清理和优化Markdown内容
+        并发爬取多个页面
+        
+        应在 async with WebScraper() 上下文内调用以共享浏览器。
+        html2text 转换器按线程隔离，且所有任务都运行在同一事件循环线程上，
+        转换过程中不会被其他任务打断。
         
         Args:
-            markdown: 原始Markdown内容
+            urls: URL列表
+            concurrency: 最大并发页面数
+            wait_time: 每个页面的等待时间（秒）
             
         Returns:
-            清理后的Markdown内容
+            与 urls 顺序一致的结果列表，元素为Markdown内容、None或异常
         """
-        if not markdown:
-            return ""
+        semaphore = asyncio.Semaphore(concurrency)
         
-        lines = markdown.split('\n')
-        cleaned_lines = []
+        async def scrape_one(url: str) -> Optional[str]:
+            async with semaphore:
+                return await self.scrape_to_markdown(url, wait_time=wait_time)
         
-        for line in lines:
-            # 移除过多的空行
-            if line.strip() or (cleaned_lines and cleaned_lines[-1].strip()):
-                cleaned_lines.append(line)
+        return await asyncio.gather(*(scrape_one(url) for url in urls),
+                                    return_exceptions=True)
+    
+    async def _scrape_with_browser(self, browser, url: str, wait_time: int) -> str:
+        """在给定浏览器中打开新页面爬取URL"""
+        page = await browser.new_page()
+        try:
+            # 设置用户代理
+            await page.set_extra_http_headers({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            })
+            
+            # 拦截图片、字体、媒体和样式表请求
+            await page.route("**/*", _route_resource)
+            
+            # 访问页面
+            await page.goto(url, wait_until='networkidle', timeout=30000)
+            
+            # 等待指定时间，确保动态内容加载
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+            
+            # 获取精简后的页面主体HTML
+            content = await page.evaluate(_EXTRACT_CONTENT_JS)
+        finally:
+            await page.close()
         
-        # 限制连续空行不超过2行
-        result_lines = []
-        empty_count = 0
+        # 转换为Markdown
+        markdown = self.h2t.handle(content)
         
-        for line in cleaned_lines:
-            if line.strip():
-                result_lines.append(line)
-                empty_count = 0
-            else:
-                if empty_count < 2:
-                    result_lines.append(line)
-                empty_count += 1
+        # 清理和优化Markdown内容
+        markdown = self._clean_markdown(markdown)
         
-        return '\n'.join(result_lines)
+        self.logger.info(f"成功爬取页面: {url}, 内容长度: {len(markdown)}")
+        return markdown
+    
+    def _clean_markdown(self, markdown: str) -> str:
+        """
+        清理和优化Markdown内容
+        
+        Args:
+            markdown: 原始Markdown内容
+            
+        Returns:
+            清理后的Markdown内容
+        """
+        return _BLANK_RE.sub('\n\n', markdown).strip() if markdown else ''
@@ -6,15 +6,36 @@ URL信息收集和存储系统 - Web界面演示启动脚本
 
 import os
 import sys
-import time
+import threading
 import webbrowser
 import subprocess
+import importlib.util
 from pathlib import Path
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# 环境检查需要查看的目录（相对项目根目录）
+_SCAN_DIRS = ("", "src", "Zhil_template", "web", "web/static/css", "web/static/js")
+
+def _write_lines(lines):
+    """将多行文本拼接后一次写入标准输出"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def _collect_paths(root, subdirs=_SCAN_DIRS):
+    """每个目录只做一次 scandir，返回其中条目的相对路径集合"""
+    known_paths = set()
+    for subdir in subdirs:
+        try:
+            with os.scandir(root / subdir) as entries:
+                for entry in entries:
+                    known_paths.add(f"{subdir}/{entry.name}" if subdir else entry.name)
+        except OSError:
+            continue
+    return known_paths
+
 def check_environment():
     """检查运行环境"""
     print("🔍 检查运行环境...")
@@ -26,6 +47,9 @@ def check_environment():
     
     print(f"✅ Python版本: {sys.version}")
     
+    # 一次性收集项目结构
+    known_paths = _collect_paths(project_root)
+    
     # 检查项目结构
     required_files = [
         "src/api_service.py",
@@ -33,29 +57,26 @@ def check_environment():
     ]
     
     # 检查Web模板（优先新模板，回退旧模板）
-    zhil_template_dir = project_root / "Zhil_template"
-    web_dir = project_root / "web"
-    
     web_template_available = False
     
-    if zhil_template_dir.exists():
+    if "Zhil_template" in known_paths:
         print("🎨 发现新版Zhil模板")
         # 检查关键文件
-        if (zhil_template_dir / "package.json").exists():
+        if "Zhil_template/package.json" in known_paths:
             print("✅ Zhil模板结构完整")
             web_template_available = True
             
             # 检查是否已安装依赖
-            if not (zhil_template_dir / "node_modules").exists():
+            if "Zhil_template/node_modules" not in known_paths:
                 print("⚠️ 注意：请先安装依赖 (cd Zhil_template && npm install)")
             
             # 检查是否已构建
-            if not (zhil_template_dir / ".next").exists():
+            if "Zhil_template/.next" not in known_paths:
                 print("💡 提示：可运行 'npm run build' 构建生产版本，或使用开发模式")
         else:
             print("❌ Zhil模板结构不完整，缺少 package.json")
     
-    elif web_dir.exists():
+    elif "web" in known_paths:
         print("📱 使用旧版Web模板作为备用")
         required_web_files = [
             "web/index.html",
@@ -63,10 +84,7 @@ def check_environment():
             "web/static/js/app.js"
         ]
         
-        missing_web_files = []
-        for file_path in required_web_files:
-            if not (project_root / file_path).exists():
-                missing_web_files.append(file_path)
+        missing_web_files = [f for f in required_web_files if f not in known_paths]
         
         if not missing_web_files:
             print("✅ 旧版Web模板结构完整")
@@ -78,10 +96,7 @@ def check_environment():
         print("❌ 未找到任何Web模板目录")
     
     # 检查必需的后端文件
-    missing_files = []
-    for file_path in required_files:
-        if not (project_root / file_path).exists():
-            missing_files.append(file_path)
+    missing_files = [f for f in required_files if f not in known_paths]
     
     if missing_files:
         print(f"❌ 缺少必需的后端文件: {missing_files}")
@@ -94,13 +109,14 @@ def check_environment():
     print("✅ 项目结构检查通过")
     
     # 检查环境变量
-    env_file = project_root / ".env"
-    if not env_file.exists():
-        print("⚠️ 警告: 未找到.env文件")
-        print("   请确保配置了必要的环境变量:")
-        print("   - NOTION_TOKEN")
-        print("   - NOTION_DATABASE_ID") 
-        print("   - DASHSCOPE_API_KEY")
+    if ".env" not in known_paths:
+        _write_lines([
+            "⚠️ 警告: 未找到.env文件",
+            "   请确保配置了必要的环境变量:",
+            "   - NOTION_TOKEN",
+            "   - NOTION_DATABASE_ID",
+            "   - DASHSCOPE_API_KEY",
+        ])
         return False
     
     print("✅ 环境配置文件存在")
@@ -110,18 +126,17 @@ def install_dependencies():
     """安装依赖（如果需要）"""
     print("📦 检查依赖...")
     
-    try:
-        import fastapi
-        import uvicorn
-        import requests
-        import playwright
-        print("✅ 核心依赖已安装")
-        return True
-    except ImportError as e:
-        print(f"❌ 缺少依赖: {e}")
+    # 只检查模块是否可找到，不实际导入
+    missing = [m for m in ("fastapi", "uvicorn", "requests", "playwright")
+               if importlib.util.find_spec(m) is None]
+    if missing:
+        print(f"❌ 缺少依赖: {', '.join(missing)}")
         print("💡 运行以下命令安装依赖:")
         print("   pip install -r requirements.txt")
         return False
+    
+    print("✅ 核心依赖已安装")
+    return True
 
 def test_api_connection():
     """测试API连接"""
@@ -154,58 +169,69 @@ def start_web_server(host="127.0.0.1", port=8000, auto_open=True):
         # 导入FastAPI应用
         from src.api_service import app
         
-        # 启动信息
-        print("=" * 60)
-        print("🎨 Zhil - URL信息收集和存储系统")
-        print("=" * 60)
-        print(f"📱 Web界面: http://{host}:{port}/ui")
-        print(f"📚 API文档: http://{host}:{port}/docs")
-        print(f"❤️ 健康检查: http://{host}:{port}/health")
-        print(f"🔧 系统配置: http://{host}:{port}/config")
-        print("=" * 60)
+        # 启动信息（拼成一段文本一次写出）
+        separator = "=" * 60
+        banner = [
+            separator,
+            "🎨 Zhil - URL信息收集和存储系统",
+            separator,
+            f"📱 Web界面: http://{host}:{port}/ui",
+            f"📚 API文档: http://{host}:{port}/docs",
+            f"❤️ 健康检查: http://{host}:{port}/health",
+            f"🔧 系统配置: http://{host}:{port}/config",
+            separator,
+        ]
         
         # 检查使用的模板类型
         zhil_template_dir = project_root / "Zhil_template"
         if zhil_template_dir.exists() and (zhil_template_dir / ".next").exists():
-            print("🎨 使用新版 Zhil 模板 (生产模式)")
+            banner.append("🎨 使用新版 Zhil 模板 (生产模式)")
         elif zhil_template_dir.exists():
-            print("🎨 使用新版 Zhil 模板 (开发模式)")
-            print("💡 建议：运行 'npm run build' 构建生产版本")
+            banner.append("🎨 使用新版 Zhil 模板 (开发模式)")
+            banner.append("💡 建议：运行 'npm run build' 构建生产版本")
         else:
-            print("📱 使用旧版模板 (备用模式)")
+            banner.append("📱 使用旧版模板 (备用模式)")
         
-        print("=" * 60)
-        print("💡 使用说明:")
-        print("1. 打开Web界面进行交互操作")
-        print("2. 输入URL，系统将自动提取信息并存储到Notion")
-        print("3. 支持单个URL和批量URL处理")
-        print("4. 查看处理历史和系统状态")
-        print("5. 按 Ctrl+C 停止服务")
-        print("=" * 60)
+        banner += [
+            separator,
+            "💡 使用说明:",
+            "1. 打开Web界面进行交互操作",
+            "2. 输入URL，系统将自动提取信息并存储到Notion",
+            "3. 支持单个URL和批量URL处理",
+            "4. 查看处理历史和系统状态",
+            "5. 按 Ctrl+C 停止服务",
+            separator,
+        ]
+        _write_lines(banner)
         
-        # 自动打开浏览器
+        # 自动打开浏览器（等待服务启动后只打开一次；服务未能启动时取消）
+        browser_timer = None
         if auto_open:
             def open_browser():
-                time.sleep(2)  # 等待服务启动
                 try:
-                    webbrowser.open(f"http://{host}:{port}/ui")
+                    webbrowser.open_new_tab(f"http://{host}:{port}/ui")
                     print(f"🌍 已自动打开浏览器: http://{host}:{port}/ui")
                 except:
                     print(f"💡 请手动打开浏览器访问: http://{host}:{port}/ui")
             
-            import threading
-            threading.Thread(target=open_browser, daemon=True).start()
+            browser_timer = threading.Timer(2.0, open_browser)
+            browser_timer.daemon = True
+            browser_timer.start()
         
         # 启动Uvicorn服务器
-        import uvicorn
-        uvicorn.run(
-            app,
-            host=host,
-            port=port,
-            log_level="info",
-            access_log=True,
-            reload=False  # 生产模式，不启用热重载
-        )
+        try:
+            import uvicorn
+            uvicorn.run(
+                app,
+                host=host,
+                port=port,
+                log_level="info",
+                access_log=True,
+                reload=False  # 生产模式，不启用热重载
+            )
+        finally:
+            if browser_timer is not None:
+                browser_timer.cancel()
         
     except KeyboardInterrupt:
         print("\n👋 用户中断，正在停止服务...")
@@ -217,8 +243,10 @@ def start_web_server(host="127.0.0.1", port=8000, auto_open=True):
 
 def main():
     """主函数"""
-    print("🎯 URL信息收集和存储系统 - Web界面演示启动器")
-    print("=" * 60)
+    _write_lines([
+        "🎯 URL信息收集和存储系统 - Web界面演示启动器",
+        "=" * 60,
+    ])
     
     # 环境检查
     if not check_environment():
@@ -235,8 +263,7 @@ def main():
         print("\n❌ API连接测试失败，请检查配置")
         return False
     
-    print("\n✅ 所有检查通过，准备启动Web服务...")
-    print()
+    _write_lines(["\n✅ 所有检查通过，准备启动Web服务...", ""])
     
     # 启动Web服务器
     try: